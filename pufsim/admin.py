@@ -1,4 +1,4 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.urls import reverse
 from django.utils.html import format_html
 
@@ -30,3 +30,22 @@ class CompositePUFGeneratorAdmin(admin.ModelAdmin):
     list_filter = ('architecture', 'child_architecture')
     list_display = ('name', 'id',) + list_filter + ('levels',)
     search_fields = list_display
+
+
+@admin.register(models.PUFPopulation)
+class PUFPopulationAdmin(admin.ModelAdmin):
+    list_filter = ('puf_type',)
+    list_display = ('name', 'id',) + list_filter + ('puf_id', 'size', 'seed', 'version', 'built')
+    search_fields = ('name', 'id')
+    actions = ['build']
+
+    def build(self, request, queryset):
+        for obj in queryset:
+            try:
+                obj.build()
+                msg = 'PUFPopulation[{}]: built version {} with {} PUFs'.format(obj.pk, obj.version, obj.size)
+                self.message_user(request, msg)
+            except ValueError as e:
+                self.message_user(request, 'PUFPopulation[{}]: build failed: {}'.format(obj.pk, e), messages.ERROR)
+    build.short_description = 'Build selected PUF populations'
+    build.allowed_permissions = ('change',)
@@ -1,41 +1,113 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.http import HttpResponseRedirect
 
-from .base import AnalysisModelAdmin
+from .base import AnalysisModelAdmin, StatusListFilter
 from .. import models
 
 
 @admin.register(models.BitflipAnalyzer)
 class BitflipAnalyzerAdmin(AnalysisModelAdmin):
-    list_filter = ('puf_generator',)
-    list_display = ('name', 'id', 'pid', 'progress',) + list_filter + ('base_challenge',
+    list_filter = ('puf_generator', StatusListFilter)
+    list_select_related = ('puf_generator',)
+    list_display = ('name', 'id', 'pid', 'get_progress', 'puf_generator', 'base_challenge',
         'number_of_pufs', 'operations',)
-    search_fields = ('id', 'pid', 'progress') + list_filter
-    readonly_fields = ('data',)
+    search_fields = ('name', 'puf_generator__name')
+    readonly_fields = ('result_meta',)
 
 
 @admin.register(models.ChallengePairAnalyzer)
 class ChallengePairAnalyzerAdmin(AnalysisModelAdmin):
-    list_filter = ('puf_generator',)
-    list_display = ('name', 'id', 'pid', 'progress',) + list_filter + ('base_challenge',
+    list_filter = ('puf_generator', StatusListFilter)
+    list_select_related = ('puf_generator',)
+    list_display = ('name', 'id', 'pid', 'get_progress', 'puf_generator', 'base_challenge',
         'test_challenge', 'number_of_pufs', 'operations',)
-    search_fields = ('id', 'pid', 'progress') + list_filter
-    readonly_fields = ('data',)
+    search_fields = ('name', 'puf_generator__name')
+    readonly_fields = ('result_meta',)
 
 
 @admin.register(models.NeighborPredictor)
 class NeighborPredictorAdmin(AnalysisModelAdmin):
-    list_filter = ('puf_generator',)
-    list_display = ('name', 'id', 'pid', 'progress',) + list_filter + ('k', 'distance',
+    list_filter = ('puf_generator', StatusListFilter)
+    list_select_related = ('puf_generator',)
+    list_display = ('name', 'id', 'pid', 'get_progress', 'puf_generator', 'k', 'distance',
         'known_set_limit', 'number_of_pufs', 'iterations_per_puf',
         'hop_by_power_of_two', 'operations',)
-    search_fields = ('id', 'pid', 'progress') + list_filter
-    readonly_fields = ('data',)
+    search_fields = ('name', 'puf_generator__name')
+    readonly_fields = ('result_meta',)
 
 
 @admin.register(models.BiasTester)
 class BiasTesterAdmin(AnalysisModelAdmin):
-    list_filter = ('puf_type',)
-    list_display = ('name', 'id', 'pid', 'progress',) + list_filter + ('puf_type',
+    list_filter = ('puf_type', StatusListFilter)
+    list_select_related = ('puf_type',)
+    list_display = ('name', 'id', 'pid', 'get_progress', 'puf_type',
         'puf_id', 'number_of_pufs', 'n', 'operations',)
-    search_fields = ('id', 'pid', 'progress')
-    readonly_fields = ('data',)
+    search_fields = ('name',)
+    readonly_fields = ('result_meta',)
+
+
+@admin.register(models.ReliabilityAnalyzer)
+class ReliabilityAnalyzerAdmin(AnalysisModelAdmin):
+    list_filter = ('puf_type', StatusListFilter)
+    list_select_related = ('puf_type',)
+    list_display = ('name', 'id', 'pid', 'get_progress', 'puf_type', 'puf_id',
+        'number_of_pufs', 'challenges', 'samples', 'operations',)
+    search_fields = ('name',)
+    readonly_fields = ('result_meta',)
+
+
+@admin.register(models.UniquenessAnalyzer)
+class UniquenessAnalyzerAdmin(AnalysisModelAdmin):
+    list_filter = ('puf_type', StatusListFilter)
+    list_select_related = ('puf_type',)
+    list_display = ('name', 'id', 'pid', 'get_progress', 'puf_type', 'puf_id',
+        'number_of_pufs', 'challenges', 'operations',)
+    search_fields = ('name',)
+    readonly_fields = ('result_meta',)
+
+
+@admin.register(models.ModelingAttack)
+class ModelingAttackAdmin(AnalysisModelAdmin):
+    list_filter = ('puf_type', StatusListFilter)
+    list_select_related = ('puf_type',)
+    list_display = ('name', 'id', 'pid', 'get_progress', 'puf_type', 'puf_id',
+        'number_of_pufs', 'min_training_crps', 'max_training_crps', 'test_crps', 'operations',)
+    search_fields = ('name',)
+    readonly_fields = ('result_meta',)
+
+
+@admin.register(models.Sweep)
+class SweepAdmin(AnalysisModelAdmin):
+    list_filter = ('analyzer_type',)
+    list_select_related = ('analyzer_type',)
+    list_display = ('name', 'id',) + list_filter + ('analyzer_id', 'grid', 'operations',)
+    search_fields = ('name',)
+    search_exact_fields = ('id',)
+    readonly_fields = ('get_progress', 'get_status', 'points', 'result_meta',)
+
+    def get_queryset(self, request):
+        return admin.ModelAdmin.get_queryset(self, request).defer('result')
+
+    def run_view(self, request, **kwargs):
+        inst = self.get_model_instance(request, **kwargs)
+        if not type(inst) is tuple:
+            return inst
+        (pk, obj) = inst
+        if obj.get_status() == 'running':
+            messages.add_message(request, messages.WARNING, f'{obj} is already running')
+            return HttpResponseRedirect(self.get_list_url())
+        owner = request.user if request.user.is_authenticated else None
+        n = obj.enqueue(owner=owner)
+        messages.add_message(request, messages.INFO, f'{obj} queued {n} analyzers')
+        return HttpResponseRedirect(self.get_list_url())
+
+
+@admin.register(models.Job)
+class JobAdmin(admin.ModelAdmin):
+    list_filter = ('state', 'kind', 'analyzer_type',)
+    list_select_related = ('analyzer_type', 'owner')
+    list_display = ('id', 'owner', 'priority') + list_filter + ('analyzer_id', 'worker',
+        'created', 'started', 'finished',)
+    list_editable = ('priority',)
+    search_fields = ('id', 'analyzer_id', 'worker')
+    readonly_fields = ('worker', 'error', 'started', 'finished')
@@ -1,48 +1,52 @@
-from django.apps import apps
 from django.contrib import admin, messages
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Q
 from django.http import HttpResponseRedirect
 from django.template.response import TemplateResponse
 from django.urls import path, reverse
 from django.utils.html import format_html
 
-from base64 import b64encode
 from functools import update_wrapper
-from io import BytesIO
-from matplotlib import pyplot as plt
-import numpy as np
-import puflib as pl
 
 from .. import models
+from ..graphs import bar_graph, line_graph
 
 
-def bar_graph(data, top=1, title='', xlabel='', ylabel=''):
-    b = BytesIO()
-    fig, ax = plt.subplots()
-    values = list(filter(lambda x: isinstance(x, (int, float)), data.values()))
-    indices = list(range(len(values)))
-    bar_width = 0.4
-    bar = ax.bar(indices, values, bar_width, color='black')
-    ax.set_xlabel(xlabel)
-    ax.set_ylabel(ylabel)
-    ax.set_title(title)
-    ax.set_xticks(indices)
-    ax.set_xticklabels([str(x) for x in data.keys()])
-    fig.tight_layout()
-    plt.ylim(0, top)
-    plt.savefig(b, format='png')
-    return 'data:image/png;base64, ' + b64encode(b.getvalue()).decode()
+class StatusListFilter(admin.SimpleListFilter):
+    title = 'status'
+    parameter_name = 'status'
+
+    def lookups(self, request, model_admin):
+        return [(s, s) for s in ('new', 'queued', 'running', 'done', 'failed')]
+
+    def queryset(self, request, queryset):
+        if self.value() is None: return queryset
+        return queryset.model.filter_status(queryset, self.value())
 
 
 class AnalysisModelAdmin(admin.ModelAdmin):
+    # integer columns a numeric search term is matched exactly against, so
+    # their indexes are used instead of a ``LIKE`` over the table
+    search_exact_fields = ('id', 'pid', 'progress')
 
     class Meta:
         abstract = True
 
+    def get_search_results(self, request, queryset, search_term):
+        results, use_distinct = super().get_search_results(request, queryset, search_term)
+        term = search_term.strip()
+        if term.isdigit():
+            q = Q()
+            for field in self.search_exact_fields:
+                q |= Q(**{field: int(term)})
+            results |= queryset.filter(q)
+        return results, use_distinct
+
     def get_queryset(self, *args, **kwargs):
-        for model in apps.get_app_config('pufsim_analysis').get_models():
-            model.check_pids()
-        return super().get_queryset(*args, **kwargs)
+        self.model.reap_stale()
+        # the result payload, metadata and checkpoint are loaded on demand;
+        # whether there is a result is told by the ``result_digest``
+        return super().get_queryset(*args, **kwargs).defer('result', 'result_meta', 'checkpoint', 'checkpoint_meta')
 
     def operations(self, obj):
         ops = obj.get_operations()
@@ -90,7 +94,7 @@ class AnalysisModelAdmin(admin.ModelAdmin):
             r = HttpResponseRedirect(self.get_list_url())
         return r
 
-    def run_view(self, request, **kwargs):
+    def run_view(self, request, resume=False, **kwargs):
         inst = self.get_model_instance(request, **kwargs)
         if not type(inst) is tuple:
             return inst
@@ -102,14 +106,24 @@ class AnalysisModelAdmin(admin.ModelAdmin):
                 f'{obj} is already running',
             )
         else:
-            obj.spawn()
-            messages.add_message(
-                request,
-                messages.INFO,
-                f'{obj} spawned'
-            )
+            owner = request.user if request.user.is_authenticated else None
+            if obj.enqueue(owner=owner, resume=resume):
+                messages.add_message(
+                    request,
+                    messages.INFO,
+                    f'{obj} queued'
+                )
+            else:
+                messages.add_message(
+                    request,
+                    messages.WARNING,
+                    f'{obj} is already queued',
+                )
         return HttpResponseRedirect(self.get_list_url())
 
+    def resume_view(self, request, **kwargs):
+        return self.run_view(request, resume=True, **kwargs)
+
     def showdata_view(self, request, **kwargs):
         inst = self.get_model_instance(request, **kwargs)
         if not type(inst) is tuple:
@@ -120,15 +134,29 @@ class AnalysisModelAdmin(admin.ModelAdmin):
             if data_display['type'] == 'message':
                 messages.add_message(request, messages.SUCCESS, data_display['msg'])
                 return HttpResponseRedirect(self.get_list_url())
-            elif data_display['type'] == 'bar_graph':
+            elif data_display['type'] in ('bar_graph', 'line_graph'):
                 # get context for django admin template
                 context = self.admin_site.each_context(request)
                 context['opts'] = self.opts
                 context['original'] = obj
                 # get custom context for data renderer
-                data = eval(data_display['data'])
-                context['data_graph'] = bar_graph(data, top=data_display['graph_top'])
-                context['data_raw'] = data
+                data = data_display['data']
+                if data_display['type'] == 'bar_graph':
+                    context['data_graph'] = bar_graph(
+                        data,
+                        top=data_display['graph_top'],
+                        digest=data_display['digest'],
+                    )
+                else:
+                    context['data_graph'] = line_graph(
+                        data_display['series'],
+                        xlabel=data_display['xlabel'],
+                        ylabel=data_display['ylabel'],
+                        digest=data_display['digest'],
+                    )
+                context['data_raw'] = dict(data)
+                if data_display['meta']:
+                    context['data_raw']['meta'] = data_display['meta']
                 return TemplateResponse(
                     request,
                     'pufsim_analysis/data_renderer.html',
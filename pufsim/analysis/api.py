@@ -0,0 +1,88 @@
+"""
+Read-only JSON API for analyzer results.
+
+``GET /api/analysis/<model>/<pk>/`` returns an analyzer's progress, status
+and result. Responses carry a strong ``ETag`` derived from the result digest,
+name, progress, status and the selected fields, so a poll with a matching
+``If-None-Match`` gets a ``304`` without the result payload being read.
+
+``?fields=`` is a comma-separated list of ``id``, ``name``, ``progress``,
+``status``, ``meta``, ``digest`` and ``arrays``; ``arrays.<name>`` selects a
+single result array, so large per-PUF arrays can be skipped.
+
+Only active staff users with the view permission of the analyzer model get
+a response.
+"""
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse
+from django.views import View
+from django.views.decorators.http import condition
+import hashlib
+import json
+
+from . import models
+
+FIELDS = ['id', 'name', 'progress', 'status', 'meta', 'digest', 'arrays']
+
+
+def get_analyzer(request, model, pk, payload=False):
+    for cls in models.get_analyzer_models():
+        if cls._meta.model_name == model:
+            break
+    else:
+        raise Http404('no analyzer model {}'.format(model))
+    if not request.user.has_perm('{}.view_{}'.format(cls._meta.app_label, model)):
+        raise PermissionDenied
+    deferred = ['checkpoint', 'checkpoint_meta'] if payload else ['result', 'checkpoint', 'checkpoint_meta']
+    qs = cls.objects.defer(*deferred)
+    try:
+        return qs.get(pk=pk)
+    except cls.DoesNotExist:
+        raise Http404('no {} {}'.format(model, pk))
+
+
+def get_fields(request):
+    fields = request.GET.get('fields')
+    if not fields: return FIELDS
+    return [f.strip() for f in fields.split(',') if f.strip()]
+
+
+def get_etag(request, model, pk):
+    obj = get_analyzer(request, model, pk)
+    version = repr((obj.result_digest, obj.name, obj.get_progress(), obj.get_status(), get_fields(request)))
+    return hashlib.sha256(version.encode()).hexdigest()
+
+
+class AnalyzerResultAPI(View):
+    """
+    Return an analyzer's progress, status and result as JSON.
+    """
+
+    def get(self, request, model, pk):
+        fields = get_fields(request)
+        arrays = [f.split('.', 1)[1] for f in fields if f.startswith('arrays.')]
+        payload = 'arrays' in fields or bool(arrays)
+        obj = get_analyzer(request, model, pk, payload=payload)
+        values = {
+            'id': lambda: obj.pk,
+            'name': lambda: obj.name,
+            'progress': obj.get_progress,
+            'status': obj.get_status,
+            'digest': lambda: obj.result_digest or None,
+        }
+        data = {f: values[f]() for f in fields if f in values}
+        if 'meta' in fields:
+            data['meta'] = json.loads(obj.result_meta) if obj.result_meta else None
+        result = obj.get_result() if payload else None
+        if payload and result is None:
+            data['arrays'] = None
+        elif payload:
+            names = result.arrays.keys() if 'arrays' in fields else arrays
+            data['arrays'] = {n: result[n].tolist() for n in names if n in result.arrays}
+        return JsonResponse(data)
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = condition(etag_func=get_etag)(super().as_view(**initkwargs))
+        return staff_member_required(view)
@@ -0,0 +1,67 @@
+"""
+Storage for the run state of analyzer checkpoints.
+
+The state of a run is a tree of numbers, strings, lists, tuples, dicts and
+NumPy arrays (the partial results of the shards). It is stored like a
+``Result``: the arrays as a compressed ``.npz`` blob in the analyzer's
+``checkpoint`` column and the rest of the tree as JSON in
+``checkpoint_meta``, with the arrays replaced by references to them. Loading
+it never executes code, unlike unpickling, and numeric arrays are loaded
+without ``allow_pickle``.
+"""
+from pufsim.lazy import lazy_import
+from .results import Result
+
+np = lazy_import('numpy')
+
+
+def encode(value, arrays):
+    """
+    Return ``value`` as JSON-serializable data, moving its arrays to
+    ``arrays``.
+    """
+    if isinstance(value, np.ndarray):
+        name = 'a{}'.format(len(arrays))
+        arrays[name] = value
+        return {'array': name}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return {'tuple': [encode(v, arrays) for v in value]}
+    if isinstance(value, list):
+        return [encode(v, arrays) for v in value]
+    if isinstance(value, dict):
+        return {'dict': [[encode(k, arrays), encode(v, arrays)] for k, v in value.items()]}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError('cannot checkpoint {!r}'.format(type(value)))
+
+
+def decode(data, arrays):
+    """
+    Return the value ``encode`` turned into ``data``.
+    """
+    if isinstance(data, list):
+        return [decode(v, arrays) for v in data]
+    if isinstance(data, dict):
+        if 'array' in data: return arrays[data['array']]
+        if 'tuple' in data: return tuple(decode(v, arrays) for v in data['tuple'])
+        return {decode(k, arrays): decode(v, arrays) for k, v in data['dict']}
+    return data
+
+
+def dumps(state):
+    """
+    Return ``(blob, meta_json)`` for storage.
+    """
+    arrays = {}
+    data = encode(state, arrays)
+    return Result(arrays, state=data).dumps()
+
+
+def loads(blob, meta_json):
+    """
+    Load a stored run state.
+    """
+    result = Result.loads(blob, meta_json)
+    return decode(result.meta['state'], result.arrays)
@@ -0,0 +1,43 @@
+"""
+Confidence intervals for Monte Carlo estimates.
+
+Analyzers with a ``target_precision`` stop simulating PUFs as soon as the
+confidence interval of every bin of their estimate is narrower than the
+target, and store the interval they achieved with the result. Intervals are
+given as half-widths in percentage points.
+"""
+from statistics import NormalDist
+
+from pufsim.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+
+def z_score(confidence):
+    """
+    Return the two-sided standard normal quantile for ``confidence``.
+    """
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def binomial_interval(successes, trials, confidence=0.95):
+    """
+    Return the half-width of the Wilson score interval of each proportion
+    ``successes / trials``, in percent.
+    """
+    successes = np.asarray(successes, dtype=float)
+    if not trials: return np.full(successes.shape, np.inf)
+    z = z_score(confidence)
+    p = successes / trials
+    half = z * np.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / (1 + z**2 / trials)
+    return 100 * half
+
+
+def mean_interval(values, confidence=0.95):
+    """
+    Return the half-width of the normal interval of the mean of ``values``,
+    in the units of ``values``.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < 2: return np.inf
+    return z_score(confidence) * values.std(ddof=1) / np.sqrt(len(values))
@@ -0,0 +1,87 @@
+"""
+Rendering of analyzer results as graphs.
+
+Finished results never change, so rendered graphs are cached with Django's
+cache framework (``PUFSIM_GRAPH_CACHE``), keyed on a digest of the stored
+result and the render parameters. The cache backend's ``MAX_ENTRIES`` bounds
+how many graphs are kept.
+"""
+from django.core.cache import caches
+
+from base64 import b64encode
+import hashlib
+from io import BytesIO
+
+from pufsim.settings import get_setting
+
+
+def render_bar_graph(data, top=1, title='', xlabel='', ylabel=''):
+    from matplotlib import pyplot as plt
+    b = BytesIO()
+    fig, ax = plt.subplots()
+    values = list(filter(lambda x: isinstance(x, (int, float)), data.values()))
+    indices = list(range(len(values)))
+    bar_width = 0.4
+    bar = ax.bar(indices, values, bar_width, color='black')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.set_xticks(indices)
+    ax.set_xticklabels([str(x) for x in data.keys()])
+    fig.tight_layout()
+    plt.ylim(0, top)
+    plt.savefig(b, format='png')
+    plt.close(fig)
+    return 'data:image/png;base64, ' + b64encode(b.getvalue()).decode()
+
+
+def render_line_graph(series, title='', xlabel='', ylabel=''):
+    from matplotlib import pyplot as plt
+    b = BytesIO()
+    fig, ax = plt.subplots()
+    for label, (xs, ys) in series.items():
+        ax.plot(xs, ys, marker='o', label=label)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    if len(series) > 1: ax.legend()
+    fig.tight_layout()
+    plt.savefig(b, format='png')
+    plt.close(fig)
+    return 'data:image/png;base64, ' + b64encode(b.getvalue()).decode()
+
+
+def cached_graph(kind, digest, params, render):
+    """
+    Return ``render()``, cached under ``digest`` and the render ``params``.
+    """
+    if digest is None:
+        return render()
+    params = hashlib.sha256(repr(params).encode()).hexdigest()[:16]
+    key = 'pufsim:graph:{}:{}:{}'.format(kind, digest, params)
+    cache = caches[get_setting('PUFSIM_GRAPH_CACHE')]
+    graph = cache.get(key)
+    if graph is None:
+        graph = render()
+        cache.set(key, graph, get_setting('PUFSIM_GRAPH_CACHE_TIMEOUT'))
+    return graph
+
+
+def bar_graph(data, top=1, title='', xlabel='', ylabel='', digest=None):
+    """
+    Return a bar graph of ``data`` as a base64 PNG data URI.
+
+    ``digest`` identifies the content of ``data``, e.g. the analyzer's
+    ``result_digest``; without it the graph is always re-rendered.
+    """
+    return cached_graph('bar', digest, (top, title, xlabel, ylabel),
+        lambda: render_bar_graph(data, top, title, xlabel, ylabel))
+
+
+def line_graph(series, title='', xlabel='', ylabel='', digest=None):
+    """
+    Return a line graph of ``series``, a ``{label: (xs, ys)}`` dictionary,
+    as a base64 PNG data URI. ``digest`` works like for ``bar_graph``.
+    """
+    return cached_graph('line', digest, (title, xlabel, ylabel),
+        lambda: render_line_graph(series, title, xlabel, ylabel))
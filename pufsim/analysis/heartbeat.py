@@ -0,0 +1,45 @@
+"""
+Liveness tracking for running analyzers.
+
+While an analyzer runs, a background thread stamps its ``heartbeat`` column
+every ``PUFSIM_HEARTBEAT_INTERVAL`` seconds. A run whose heartbeat is older
+than ``PUFSIM_HEARTBEAT_TIMEOUT`` seconds is considered dead, which works
+across hosts, unlike probing the pid.
+"""
+from django.db import DatabaseError, connection
+from django.utils import timezone
+import threading
+
+from pufsim.settings import get_setting
+
+
+class Heartbeat(threading.Thread):
+    """
+    Context manager that stamps an analyzer's heartbeat until it exits.
+    """
+
+    def __init__(self, analyzer, interval=None):
+        super().__init__(daemon=True)
+        self.model = type(analyzer)
+        self.pk = analyzer.pk
+        self.interval = get_setting('PUFSIM_HEARTBEAT_INTERVAL') if interval is None else interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    self.model.objects.filter(pk=self.pk).update(heartbeat=timezone.now())
+                except DatabaseError:
+                    # e.g. the SQLite write lock is held; beat again later
+                    pass
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stopped.set()
+        self.join()
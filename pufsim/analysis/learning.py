@@ -0,0 +1,75 @@
+"""
+Logistic regression modeling attacks on arbiter and XOR arbiter PUFs.
+
+An arbiter PUF's delay difference is linear in the parity features of the
+challenge, so a model with one weight vector per level predicts a response
+of 1 with probability ``sigmoid(prod_l w_l . phi)``; with one level this is
+plain logistic regression. The weights are fitted with mini-batch Adam.
+
+Training sets are kept as packed ``Challenges`` and uint8 responses, and the
+parity features are only built for one mini-batch at a time, so millions of
+CRPs take little more memory than their packed challenges.
+"""
+from pufsim.lazy import lazy_import
+
+engine = lazy_import('pufsim.engine')
+np = lazy_import('numpy')
+
+
+def logits(weights, phi):
+    """
+    Return the ``(B,)`` logits of the ``(levels, F)`` ``weights`` for the
+    ``(B, F)`` parity features ``phi``, and the ``(levels, B)`` delays.
+    """
+    d = weights @ phi.T
+    return np.prod(d, axis=0), d
+
+
+def fit(challenges, responses, levels=1, epochs=10, batch_size=1000,
+        learning_rate=0.05, min_steps=1000, rng=None):
+    """
+    Fit the weights of a ``levels``-XOR model to the CRPs and return them.
+    ``challenges`` are packed ``Challenges`` and ``responses`` the matching
+    uint8 array. Small training sets are gone through more than ``epochs``
+    times, so that there are at least ``min_steps`` updates.
+    """
+    if rng is None: rng = np.random.default_rng()
+    n = len(responses)
+    epochs = max(epochs, -(-min_steps // -(-n // batch_size)))
+    features = challenges.stages + 1
+    w = rng.normal(size=(levels, features))
+    m = np.zeros_like(w)
+    v = np.zeros_like(w)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+    for epoch in range(epochs):
+        order = rng.permutation(n)
+        for i in range(0, n, batch_size):
+            batch = order[i:i+batch_size]
+            phi = engine.parity_features(challenges[batch].bits())
+            t = 2.0 * responses[batch] - 1.0
+            z, d = logits(w, phi)
+            # derivative of the mean of log(1 + exp(-t z)) by z
+            g = -t / (1.0 + np.exp(np.clip(t * z, -500, 500))) / len(batch)
+            grad = np.empty_like(w)
+            for l in range(levels):
+                others = np.prod(np.delete(d, l, axis=0), axis=0)
+                grad[l] = (g * others) @ phi
+            step += 1
+            m = beta1 * m + (1 - beta1) * grad
+            v = beta2 * v + (1 - beta2) * grad**2
+            m_hat = m / (1 - beta1**step)
+            v_hat = v / (1 - beta2**step)
+            w -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+    return w
+
+
+def predict(weights, challenges, chunk=2**16):
+    """
+    Return the uint8 responses the model predicts for packed ``challenges``.
+    """
+    r = np.empty(len(challenges), dtype=np.uint8)
+    for i in range(0, len(challenges), chunk):
+        phi = engine.parity_features(challenges[i:i+chunk].bits())
+        r[i:i+chunk] = logits(weights, phi)[0] > 0
+    return r
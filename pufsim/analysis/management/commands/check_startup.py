@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+import os
+import subprocess
+import sys
+import time
+
+from pufsim.settings import get_setting
+
+
+class Command(BaseCommand):
+    help = 'Fails if `manage.py run_analyzer --help` takes longer than the startup budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget', type=float, default=get_setting('PUFSIM_STARTUP_BUDGET'), help='seconds')
+        parser.add_argument('--runs', type=int, default=5)
+
+    def handle(self, *args, **options):
+        cmd = [sys.executable, '-m', 'django', 'run_analyzer', '--help']
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+        times = []
+        for i in range(options['runs']):
+            start = time.perf_counter()
+            subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        median = sorted(times)[len(times) // 2]
+        msg = 'run_analyzer startup: {:.3f}s median of {} runs (budget {:.3f}s)'.format(
+            median, len(times), options['budget'])
+        if median > options['budget']:
+            raise CommandError(msg)
+        self.stdout.write(msg)
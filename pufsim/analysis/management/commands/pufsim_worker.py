@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+
+from pufsim.analysis import models
+from pufsim.settings import get_setting
+
+
+def work(poll_interval, workers):
+    """
+    Worker loop: claim queued jobs and run them, forever, each on ``workers``
+    shard processes unless the analyzer sets its own.
+    """
+    name = '{}:{}'.format(socket.gethostname(), os.getpid())
+    # stop through ``SystemExit`` on ``terminate()``, so the running job is
+    # failed rather than left running
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    while True:
+        try:
+            job = models.Job.claim(name)
+        except DatabaseError:
+            # e.g. another worker holds the SQLite write lock; retry later
+            job = None
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        print("PUFSIM :: (pufsim_worker) {} running {}".format(name, job))
+        job.execute(workers=workers)
+
+
+class Command(BaseCommand):
+    help = 'Runs a pool of workers that execute queued analyzer jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=get_setting('PUFSIM_WORKER_PROCESSES'))
+        parser.add_argument('--poll-interval', type=float, default=get_setting('PUFSIM_WORKER_POLL_INTERVAL'))
+
+    def handle(self, *args, **options):
+        # the workers open their own database connections
+        connections.close_all()
+        # share the PUFSIM_WORKERS shard processes between the workers, so
+        # running one job on each doesn't oversubscribe the CPUs
+        workers = max(1, (get_setting('PUFSIM_WORKERS') or 1) // options['processes'])
+        procs = []
+        for i in range(options['processes']):
+            # not daemonic, so analyzers can start their own shard pools
+            p = multiprocessing.Process(target=work, args=(options['poll_interval'], workers))
+            p.start()
+            procs.append(p)
+        print("PUFSIM :: (pufsim_worker) started {} workers with {} shard processes each".format(len(procs), workers))
+        try:
+            # reap runs on any host that stopped sending heartbeats
+            while any(p.is_alive() for p in procs):
+                for model in models.get_analyzer_models():
+                    model.reap_stale()
+                time.sleep(get_setting('PUFSIM_HEARTBEAT_INTERVAL'))
+        except KeyboardInterrupt:
+            for p in procs:
+                p.terminate()
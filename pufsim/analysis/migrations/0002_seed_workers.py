@@ -0,0 +1,53 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biastester',
+            name='seed',
+            field=models.PositiveIntegerField(blank=True, help_text='Seed for the random number generators, so runs can be reproduced; leave blank to pick one at random.', null=True),
+        ),
+        migrations.AddField(
+            model_name='biastester',
+            name='workers',
+            field=models.PositiveIntegerField(default=0, help_text='Number of processes to run on; 0 for the PUFSIM_WORKERS setting.'),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='seed',
+            field=models.PositiveIntegerField(blank=True, help_text='Seed for the random number generators, so runs can be reproduced; leave blank to pick one at random.', null=True),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='workers',
+            field=models.PositiveIntegerField(default=0, help_text='Number of processes to run on; 0 for the PUFSIM_WORKERS setting.'),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='seed',
+            field=models.PositiveIntegerField(blank=True, help_text='Seed for the random number generators, so runs can be reproduced; leave blank to pick one at random.', null=True),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='workers',
+            field=models.PositiveIntegerField(default=0, help_text='Number of processes to run on; 0 for the PUFSIM_WORKERS setting.'),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='seed',
+            field=models.PositiveIntegerField(blank=True, help_text='Seed for the random number generators, so runs can be reproduced; leave blank to pick one at random.', null=True),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='workers',
+            field=models.PositiveIntegerField(default=0, help_text='Number of processes to run on; 0 for the PUFSIM_WORKERS setting.'),
+        ),
+    ]
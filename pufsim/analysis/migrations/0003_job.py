@@ -0,0 +1,36 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('pufsim_analysis', '0002_seed_workers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('analyzer_id', models.PositiveIntegerField()),
+                ('priority', models.IntegerField(default=0, help_text='Queued jobs with a higher priority are run first.')),
+                ('state', models.CharField(choices=[('queued', 'queued'), ('running', 'running'), ('done', 'done'), ('failed', 'failed')], db_index=True, default='queued', max_length=30)),
+                ('worker', models.CharField(blank=True, editable=False, max_length=255)),
+                ('error', models.TextField(blank=True, editable=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('started', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('finished', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('analyzer_type', models.ForeignKey(limit_choices_to=models.Q(('app_label', 'pufsim_analysis'), models.Q(_negated=True, model='job')), on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType')),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Job',
+            },
+        ),
+    ]
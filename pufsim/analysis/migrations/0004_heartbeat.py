@@ -0,0 +1,45 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:32
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def stamp_running(apps, schema_editor):
+    """
+    Give runs that were in progress a heartbeat, so they get reaped if their
+    process is gone.
+    """
+    for name in ['BiasTester', 'BitflipAnalyzer', 'ChallengePairAnalyzer', 'NeighborPredictor']:
+        model = apps.get_model('pufsim_analysis', name)
+        model.objects.exclude(pid=0).update(heartbeat=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0003_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biastester',
+            name='heartbeat',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='heartbeat',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='heartbeat',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='heartbeat',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(stamp_running, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:10
+
+import ast
+import json
+
+from django.db import migrations, models
+
+from pufsim.analysis.results import Result
+
+ANALYZERS = ['BiasTester', 'BitflipAnalyzer', 'ChallengePairAnalyzer', 'NeighborPredictor']
+
+
+def convert_data(apps, schema_editor):
+    """
+    Convert the old ``repr``-encoded ``data`` into a stored ``Result``.
+    """
+    for name in ANALYZERS:
+        model = apps.get_model('pufsim_analysis', name)
+        for obj in model.objects.exclude(data=''):
+            data = ast.literal_eval(obj.data)
+            if isinstance(data, dict):
+                meta = data.pop('meta', {})
+                result = Result.histogram(list(data.keys()), list(data.values()), **meta)
+            else:
+                result = Result(kind='count', count=int(data))
+            obj.result, obj.result_meta = result.dumps()
+            obj.save(update_fields=['result', 'result_meta'])
+
+
+def convert_result(apps, schema_editor):
+    for name in ANALYZERS:
+        model = apps.get_model('pufsim_analysis', name)
+        for obj in model.objects.exclude(result_meta=''):
+            meta = json.loads(obj.result_meta)
+            if meta.get('kind') == 'count':
+                obj.data = str(meta['count'])
+            else:
+                result = Result.loads(obj.result, obj.result_meta)
+                data = result.as_dict()
+                extra = {k: v for k, v in result.meta.items() if k != 'kind'}
+                if extra:
+                    data['meta'] = extra
+                obj.data = str(data)
+            obj.save(update_fields=['data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0004_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biastester',
+            name='result',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='result',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='result',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='result',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='biastester',
+            name='result_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='result_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='result_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='result_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(convert_data, convert_result),
+        migrations.RemoveField(
+            model_name='biastester',
+            name='data',
+        ),
+        migrations.RemoveField(
+            model_name='bitflipanalyzer',
+            name='data',
+        ),
+        migrations.RemoveField(
+            model_name='challengepairanalyzer',
+            name='data',
+        ),
+        migrations.RemoveField(
+            model_name='neighborpredictor',
+            name='data',
+        ),
+    ]
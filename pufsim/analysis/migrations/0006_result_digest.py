@@ -0,0 +1,44 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:40
+
+from django.db import migrations, models
+
+from pufsim.analysis.results import digest
+
+
+def set_digests(apps, schema_editor):
+    for name in ['BiasTester', 'BitflipAnalyzer', 'ChallengePairAnalyzer', 'NeighborPredictor']:
+        model = apps.get_model('pufsim_analysis', name)
+        for obj in model.objects.exclude(result_meta=''):
+            obj.result_digest = digest(obj.result, obj.result_meta)
+            obj.save(update_fields=['result_digest'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0005_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biastester',
+            name='result_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='result_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='result_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='result_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(set_digests, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0006_result_digest'),
+    ]
+
+    operations = [
+        # existing analyzers keep measuring with fresh noise for each flip
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='single_pass',
+            field=models.BooleanField(default=False, help_text='Evaluate the base challenge once per PUF and compare every flipped response to it; otherwise the base challenge is evaluated again (with fresh noise) for each flip.'),
+        ),
+        migrations.AlterField(
+            model_name='bitflipanalyzer',
+            name='single_pass',
+            field=models.BooleanField(default=True, help_text='Evaluate the base challenge once per PUF and compare every flipped response to it; otherwise the base challenge is evaluated again (with fresh noise) for each flip.'),
+        ),
+    ]
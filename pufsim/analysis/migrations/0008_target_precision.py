@@ -0,0 +1,53 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0007_bitflip_single_pass'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biastester',
+            name='confidence_level',
+            field=models.FloatField(default=0.95, help_text='Confidence level of the stored intervals, e.g. 0.95.'),
+        ),
+        migrations.AddField(
+            model_name='biastester',
+            name='target_precision',
+            field=models.FloatField(blank=True, help_text='Stop as soon as the confidence interval of every bin is within +/- this many percentage points; leave blank to always simulate all PUFs.', null=True),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='confidence_level',
+            field=models.FloatField(default=0.95, help_text='Confidence level of the stored intervals, e.g. 0.95.'),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='target_precision',
+            field=models.FloatField(blank=True, help_text='Stop as soon as the confidence interval of every bin is within +/- this many percentage points; leave blank to always simulate all PUFs.', null=True),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='confidence_level',
+            field=models.FloatField(default=0.95, help_text='Confidence level of the stored intervals, e.g. 0.95.'),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='target_precision',
+            field=models.FloatField(blank=True, help_text='Stop as soon as the confidence interval of every bin is within +/- this many percentage points; leave blank to always simulate all PUFs.', null=True),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='confidence_level',
+            field=models.FloatField(default=0.95, help_text='Confidence level of the stored intervals, e.g. 0.95.'),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='target_precision',
+            field=models.FloatField(blank=True, help_text='Stop as soon as the confidence interval of every bin is within +/- this many percentage points; leave blank to always simulate all PUFs.', null=True),
+        ),
+    ]
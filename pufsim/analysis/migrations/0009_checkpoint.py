@@ -0,0 +1,58 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0008_target_precision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biastester',
+            name='checkpoint',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='biastester',
+            name='checkpointed',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='checkpoint',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='checkpointed',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='checkpoint',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='checkpointed',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='resume',
+            field=models.BooleanField(default=False, help_text="Continue from the analyzer's last checkpoint."),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='checkpoint',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='checkpointed',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
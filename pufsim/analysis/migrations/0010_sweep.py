@@ -0,0 +1,39 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+import gfklookupwidget.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('pufsim_analysis', '0009_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='analyzer_type',
+            field=models.ForeignKey(limit_choices_to=models.Q(('app_label', 'pufsim_analysis'), models.Q(_negated=True, model__in=['job', 'sweep'])), on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType'),
+        ),
+        migrations.CreateModel(
+            name='Sweep',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('analyzer_id', gfklookupwidget.fields.GfkLookupField(help_text='The analyzer to copy for every point of the grid; its generator is the base of the sweep.')),
+                ('grid', models.TextField(default='{}', help_text='JSON object mapping generator parameters to lists of values, e.g. {"stages": [16, 32, 64], "production_pdf.sigma": [0.1, 0.5]}. Composite generators also take "levels".')),
+                ('seed', models.PositiveIntegerField(blank=True, help_text='Seed shared by every point, so they simulate the same random draws; leave blank to pick one at random.', null=True)),
+                ('points', models.TextField(blank=True, editable=False)),
+                ('result', models.BinaryField(blank=True, null=True)),
+                ('result_meta', models.TextField(blank=True, editable=False)),
+                ('result_digest', models.CharField(blank=True, editable=False, max_length=64)),
+                ('analyzer_type', models.ForeignKey(limit_choices_to=models.Q(('app_label', 'pufsim_analysis'), models.Q(_negated=True, model__in=['job', 'sweep'])), on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType')),
+            ],
+            options={
+                'verbose_name': 'Sweep',
+            },
+        ),
+    ]
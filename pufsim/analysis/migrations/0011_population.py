@@ -0,0 +1,35 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim', '0002_pufpopulation'),
+        ('pufsim_analysis', '0010_sweep'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biastester',
+            name='population',
+            field=models.ForeignKey(blank=True, help_text='Run on the PUFs of this stored population, built from the same generator, instead of generating new ones.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='pufsim.PUFPopulation'),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='population',
+            field=models.ForeignKey(blank=True, help_text='Run on the PUFs of this stored population, built from the same generator, instead of generating new ones.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='pufsim.PUFPopulation'),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='population',
+            field=models.ForeignKey(blank=True, help_text='Run on the PUFs of this stored population, built from the same generator, instead of generating new ones.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='pufsim.PUFPopulation'),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='population',
+            field=models.ForeignKey(blank=True, help_text='Run on the PUFs of this stored population, built from the same generator, instead of generating new ones.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='pufsim.PUFPopulation'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+import gfklookupwidget.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim', '0002_pufpopulation'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('pufsim_analysis', '0012_reliability'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UniquenessAnalyzer',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('progress', models.IntegerField(default=0, editable=False)),
+                ('result', models.BinaryField(blank=True, null=True)),
+                ('result_meta', models.TextField(blank=True, editable=False)),
+                ('result_digest', models.CharField(blank=True, editable=False, max_length=64)),
+                ('pid', models.IntegerField(default=0, editable=False)),
+                ('heartbeat', models.DateTimeField(blank=True, db_index=True, editable=False, null=True)),
+                ('seed', models.PositiveIntegerField(blank=True, help_text='Seed for the random number generators, so runs can be reproduced; leave blank to pick one at random.', null=True)),
+                ('workers', models.PositiveIntegerField(default=0, help_text='Number of processes to run on; 0 for the PUFSIM_WORKERS setting.')),
+                ('target_precision', models.FloatField(blank=True, help_text='Stop as soon as the confidence interval of every bin is within +/- this many percentage points; leave blank to always simulate all PUFs.', null=True)),
+                ('checkpoint', models.BinaryField(blank=True, null=True)),
+                ('checkpointed', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('confidence_level', models.FloatField(default=0.95, help_text='Confidence level of the stored intervals, e.g. 0.95.')),
+                ('puf_id', gfklookupwidget.fields.GfkLookupField()),
+                ('number_of_pufs', models.IntegerField(default=1000)),
+                ('challenges', models.IntegerField(default=128, help_text='How many challenges, shared by all PUFs, make up a response vector')),
+                ('population', models.ForeignKey(blank=True, help_text='Run on the PUFs of this stored population, built from the same generator, instead of generating new ones.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='pufsim.PUFPopulation')),
+                ('puf_type', models.ForeignKey(limit_choices_to=models.Q(models.Q(('app_label', 'pufsim'), ('model', 'pufgenerator')), models.Q(('app_label', 'pufsim'), ('model', 'compositepufgenerator')), _connector='OR'), on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType')),
+            ],
+            options={
+                'verbose_name': 'Uniqueness Analyzer',
+            },
+        ),
+    ]
@@ -0,0 +1,122 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0014_modelingattack'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='biastester',
+            name='pid',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='biastester',
+            name='progress',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='biastester',
+            name='result_digest',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='bitflipanalyzer',
+            name='pid',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='bitflipanalyzer',
+            name='progress',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='bitflipanalyzer',
+            name='result_digest',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='challengepairanalyzer',
+            name='pid',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='challengepairanalyzer',
+            name='progress',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='challengepairanalyzer',
+            name='result_digest',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='modelingattack',
+            name='pid',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='modelingattack',
+            name='progress',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='modelingattack',
+            name='result_digest',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='neighborpredictor',
+            name='pid',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='neighborpredictor',
+            name='progress',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='neighborpredictor',
+            name='result_digest',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='reliabilityanalyzer',
+            name='pid',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='reliabilityanalyzer',
+            name='progress',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='reliabilityanalyzer',
+            name='result_digest',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='uniquenessanalyzer',
+            name='pid',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='uniquenessanalyzer',
+            name='progress',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='uniquenessanalyzer',
+            name='result_digest',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['analyzer_type', 'analyzer_id'], name='pufsim_anal_analyze_5c5b8e_idx'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:49
+
+from django.db import migrations, models
+
+
+def drop_pickled_checkpoints(apps, schema_editor):
+    # old checkpoints are pickles, which are never loaded again, so such runs
+    # start over
+    for name in ['BiasTester', 'BitflipAnalyzer', 'ChallengePairAnalyzer', 'ModelingAttack',
+            'NeighborPredictor', 'ReliabilityAnalyzer', 'UniquenessAnalyzer']:
+        model = apps.get_model('pufsim_analysis', name)
+        model.objects.filter(checkpoint__isnull=False).update(checkpoint=None, checkpointed=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0015_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='biastester',
+            name='checkpoint_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='biastester',
+            name='population_version',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='checkpoint_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='bitflipanalyzer',
+            name='population_version',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='checkpoint_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='challengepairanalyzer',
+            name='population_version',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='modelingattack',
+            name='checkpoint_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='modelingattack',
+            name='population_version',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='checkpoint_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='neighborpredictor',
+            name='population_version',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='reliabilityanalyzer',
+            name='checkpoint_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='reliabilityanalyzer',
+            name='population_version',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='uniquenessanalyzer',
+            name='checkpoint_meta',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='uniquenessanalyzer',
+            name='population_version',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(drop_pickled_checkpoints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 09:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pufsim_analysis', '0016_checkpoint_npz'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('run', 'run'), ('quicktest', 'quicktest')], default='run', help_text='What to do: run the analyzer, or Quicktest the PUF generator.', max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='analyzer_type',
+            field=models.ForeignKey(limit_choices_to=models.Q(models.Q(('app_label', 'pufsim_analysis'), models.Q(_negated=True, model__in=['job', 'sweep'])), models.Q(('app_label', 'pufsim'), ('model', 'pufgenerator')), _connector='OR'), on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType'),
+        ),
+    ]
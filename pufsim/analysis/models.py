@@ -1,41 +1,70 @@
+from django.apps import apps
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
 from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.functional import cached_property
 from gfklookupwidget.fields import GfkLookupField
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+import hashlib
+import itertools
+import json
 import math
-import numpy as np
 import os
-import puflib as pl
-import subprocess
-import sys
+import time
+import traceback
 
 
-from pufsim.models import PUFGenerator
+from pufsim.lazy import lazy_import
+from pufsim.models import PUFGenerator, PUFPopulation
+from pufsim.settings import get_setting
+from .heartbeat import Heartbeat
+from . import checkpoints, confidence
+from .progress import ProgressReporter, get_cached_progress, get_backend as get_progress_backend
+from .results import Result, digest
 
-
-def find_in_path(filename):
-    """
-    Resolve filename to full path; needed for Apache.
-    """
-    try:
-        ospath = os.environ['PATH']
-        ospath = ospath.split(os.pathsep)
-    except KeyError:
-        ospath = []
-    for p in list(sys.path) + ospath + ['/usr/local/bin']:
-        try:
-            for f in os.listdir(p):
-                if filename == f: return os.path.join(p, f)
-        except (FileNotFoundError, NotADirectoryError):
-            pass
-    return None
+engine = lazy_import('pufsim.engine')
+learning = lazy_import('pufsim.analysis.learning')
+np = lazy_import('numpy')
+pl = lazy_import('puflib')
+quicktest = lazy_import('pufsim.quicktest')
+shards = lazy_import('pufsim.analysis.shards')
 
 
 class ModelAnalyzer(models.Model):
     name = models.CharField(max_length=255)
-    progress = models.IntegerField(default=0, editable=False)
-    data = models.TextField(blank=True, editable=False)
-    pid = models.IntegerField(default=0, editable=False)
+    progress = models.IntegerField(default=0, editable=False, db_index=True)
+    result = models.BinaryField(blank=True, null=True, editable=False)
+    result_meta = models.TextField(blank=True, editable=False)
+    result_digest = models.CharField(max_length=64, blank=True, editable=False, db_index=True)
+    pid = models.IntegerField(default=0, editable=False, db_index=True)
+    heartbeat = models.DateTimeField(blank=True, null=True, editable=False, db_index=True)
+    seed = models.PositiveIntegerField(blank=True, null=True, help_text='Seed for the random number generators, so runs can be reproduced; leave blank to pick one at random.')
+    workers = models.PositiveIntegerField(default=0, help_text='Number of processes to run on; 0 for the PUFSIM_WORKERS setting.')
+    target_precision = models.FloatField(blank=True, null=True, help_text='Stop as soon as the confidence interval of every bin is within +/- this many percentage points; leave blank to always simulate all PUFs.')
+    checkpoint = models.BinaryField(blank=True, null=True, editable=False)
+    checkpoint_meta = models.TextField(blank=True, editable=False)
+    checkpointed = models.DateTimeField(blank=True, null=True, editable=False)
+    population_version = models.PositiveIntegerField(blank=True, null=True, editable=False, db_index=True)
+    population = models.ForeignKey(PUFPopulation, blank=True, null=True, on_delete=models.SET_NULL, help_text='Run on the PUFs of this stored population, built from the same generator, instead of generating new ones.')
+    confidence_level = models.FloatField(default=0.95, help_text='Confidence level of the stored intervals, e.g. 0.95.')
+
+    # upper bound on the number of PUF evaluations in one shard
+    batch_evaluations = 2**20
+    # with a target precision, the least number of batches to check it after
+    stopping_batches = 100
+    # fields holding the state of a run rather than settings
+    state_fields = ['progress', 'result', 'result_meta', 'result_digest', 'pid',
+        'heartbeat', 'checkpoint', 'checkpoint_meta', 'checkpointed', 'population_version']
+    # settings that don't change the result, so editing them keeps checkpoints
+    fingerprint_exclude = ['id', 'name', 'workers']
+    # what ``get_summary`` returns
+    summary_label = 'mean'
 
     class Meta:
         abstract = True
@@ -46,52 +75,362 @@ class ModelAnalyzer(models.Model):
         """
         ops = []
         if not self.pid: ops.append('Run')
-        if self.data and not self.pid: ops.append('ShowData')
+        if self.checkpointed and not self.pid: ops.append('Resume')
+        if self.result_digest and not self.pid: ops.append('ShowData')
         return ops
 
     @classmethod
     def get_all_operations(cls):
-        return ['Run', 'ShowData']
+        return ['Run', 'Resume', 'ShowData']
 
     @classmethod
-    def check_pids(cls):
-        objs = cls.objects.all()
-        for obj in objs:
-            obj.check_pid()
-
-    def check_pid(self):
-        if not self.pid: return
-        e = True
-        try: os.kill(self.pid, 0)
-        except OSError: e = False
-        if not e:
+    def reap_stale(cls):
+        """
+        Reset analyzers whose heartbeat has gone stale, i.e. whose process
+        died, and fail their jobs. Also fail running jobs claimed longer ago
+        than the timeout whose analyzer has no heartbeat, i.e. whose worker
+        died before starting it. Only running analyzers and jobs are looked
+        at, so these are two indexed queries when nothing is stale.
+        """
+        timeout = get_setting('PUFSIM_HEARTBEAT_TIMEOUT')
+        cutoff = timezone.now() - timedelta(seconds=timeout)
+        jobs = Job.objects.filter(analyzer_type=ContentType.objects.get_for_model(cls), state='running')
+        stale = list(cls.objects.filter(heartbeat__lt=cutoff).values_list('pk', flat=True))
+        if stale:
+            cls.objects.filter(pk__in=stale, heartbeat__lt=cutoff).update(pid=0, heartbeat=None)
+            jobs.filter(analyzer_id__in=stale).update(state='failed',
+                error='worker stopped sending heartbeats', finished=timezone.now())
+        jobs.filter(started__lt=cutoff).exclude(
+            analyzer_id__in=cls.objects.filter(heartbeat__isnull=False).values('pk'),
+        ).update(state='failed', error='worker stopped before starting the analyzer',
+            finished=timezone.now())
+
+    @contextmanager
+    def running(self):
+        """
+        Mark the analyzer as running in this process, sending heartbeats until
+        the block exits. Then remove the old population versions it may have
+        been keeping.
+        """
+        model = type(self)
+        self.pid = os.getpid()
+        self.heartbeat = timezone.now()
+        model.objects.filter(pk=self.pk).update(pid=self.pid, heartbeat=self.heartbeat)
+        try:
+            with Heartbeat(self):
+                yield self
+        finally:
             self.pid = 0
-            self.save()
+            self.heartbeat = None
+            model.objects.filter(pk=self.pk).update(pid=0, heartbeat=None)
+            if self.population_id: self.population.prune()
 
-    @transaction.atomic
-    def spawn(self):
-        obj = type(self).objects.select_for_update().get(id=self.id)
-        args = ['run_analyzer', type(self).__name__, str(self.id)]
-        py3 = find_in_path('python3')
-        py = find_in_path('python')
-        if not py3: py3 = 'python3'
-        if not py: py = 'python'
-        manage = find_in_path('manage.py')
-        if not manage: manage = 'manage.py'
-        cmd1 = ' '.join([py3, manage, *args])
-        cmd2 = ' '.join([py, manage, *args])
-        try: p = subprocess.Popen(cmd1, shell=True)
-        except: p = subprocess.Popen(cmd2, shell=True)
-        obj.pid = p.pid
+    def enqueue(self, owner=None, priority=0, resume=False):
+        """
+        Queue a run of this analyzer for the ``pufsim_worker`` pool, unless
+        one is already queued or running. Return the job, or ``None``.
+        """
+        ct = ContentType.objects.get_for_model(self)
+        with transaction.atomic():
+            active = Job.objects.select_for_update().filter(
+                analyzer_type=ct, analyzer_id=self.pk, state__in=['queued', 'running'],
+            )
+            if active.exists(): return None
+            return Job.objects.create(analyzer_type=ct, analyzer_id=self.pk,
+                owner=owner, priority=priority, resume=resume)
+
+    def copy(self, **fields):
+        """
+        Save and return a copy of this analyzer's settings, without its
+        result or run state, with ``fields`` changed.
+        """
+        obj = type(self).objects.get(pk=self.pk)
+        obj.pk = None
+        for f in self.state_fields:
+            setattr(obj, f, obj._meta.get_field(f).get_default())
+        for k, v in fields.items():
+            setattr(obj, k, v)
         obj.save()
-        return p
+        return obj
+
+    def get_batches(self, evaluations_per_puf):
+        """
+        Split ``number_of_pufs`` into batches of PUFs small enough to be
+        evaluated together, yielding ``(done, size)`` tuples.
+        """
+        size = max(1, self.batch_evaluations // max(1, evaluations_per_puf))
+        if self.target_precision:
+            size = min(size, max(1, -(-self.number_of_pufs // self.stopping_batches)))
+        for i in range(0, self.number_of_pufs, size):
+            yield i, min(size, self.number_of_pufs - i)
+
+    def get_progress(self):
+        """
+        Return the current progress, which running analyzers may be
+        publishing to the cache rather than the database.
+        """
+        if self.pid and get_progress_backend() == 'cache':
+            progress = get_cached_progress(self)
+            if progress is not None: return progress
+        return self.progress
+    get_progress.short_description = 'progress'
+    get_progress.admin_order_field = 'progress'
+
+    def get_status(self, latest_states=None):
+        """
+        Return 'running', 'queued' or 'failed' from the latest job, otherwise
+        'done' if there is a result or 'new' if there isn't. The state of the
+        latest job is looked up in ``latest_states`` (see
+        ``get_latest_states``) if given.
+        """
+        if self.pid: return 'running'
+        if latest_states is not None:
+            state = latest_states.get(self.pk)
+        else:
+            state = Job.objects.filter(
+                analyzer_type=ContentType.objects.get_for_model(self),
+                analyzer_id=self.pk,
+            ).order_by('-created').values_list('state', flat=True).first()
+        if state in ('queued', 'running', 'failed'): return state
+        return 'done' if self.result_digest else 'new'
+
+    @classmethod
+    def get_latest_states(cls, pks):
+        """
+        Return the state of the latest job of each of the analyzers ``pks``
+        that has one, in one query.
+        """
+        jobs = Job.objects.filter(
+            analyzer_type=ContentType.objects.get_for_model(cls),
+            analyzer_id__in=pks,
+        ).order_by('analyzer_id', '-created').values_list('analyzer_id', 'state')
+        states = {}
+        for pk, state in jobs:
+            states.setdefault(pk, state)
+        return states
+
+    @classmethod
+    def filter_status(cls, queryset, status):
+        """
+        Filter ``queryset`` down to the analyzers ``get_status`` would return
+        ``status`` for, using the indexed ``pid``, ``result_digest`` and job
+        columns rather than checking every analyzer.
+        """
+        jobs = Job.objects.filter(analyzer_type=ContentType.objects.get_for_model(cls))
+        latest = models.Subquery(jobs.filter(analyzer_id=models.OuterRef('pk'))
+            .order_by('-created').values('state')[:1])
+
+        def latest_in(*states):
+            # only analyzers with a job in one of the states can have it as
+            # their latest, so just those have their latest job looked up
+            return cls.objects.filter(
+                pk__in=jobs.filter(state__in=states).values('analyzer_id'),
+            ).annotate(latest_state=latest).filter(latest_state__in=states).values('pk')
+
+        if status == 'running':
+            return queryset.filter(models.Q(pid__gt=0) | models.Q(pk__in=latest_in('running')))
+        queryset = queryset.filter(pid=0)
+        if status in ('queued', 'failed'):
+            return queryset.filter(pk__in=latest_in(status))
+        queryset = queryset.exclude(pk__in=latest_in('queued', 'running', 'failed'))
+        if status == 'done':
+            return queryset.filter(result_digest__gt='')
+        return queryset.filter(result_digest='')
 
-    def run(self):
+    def get_workers(self, default=None):
         """
-        Run the analyzer and store the data.
+        Return the number of shard processes: the analyzer's ``workers``,
+        otherwise ``default``, otherwise the ``PUFSIM_WORKERS`` setting.
+        """
+        return self.workers or default or get_setting('PUFSIM_WORKERS') or 1
+
+    def get_evaluations_per_puf(self):
+        """
+        Return how many challenges are evaluated for each PUF.
         """
         raise NotImplementedError
 
+    def clean(self):
+        population = self.population
+        if population is None: return
+        if population.puf_generator != self.puf_generator:
+            raise ValidationError({'population': 'the population is of a different generator'})
+        if not population.built:
+            raise ValidationError({'population': 'the population has not been built'})
+        if self.number_of_pufs > population.size:
+            raise ValidationError({'number_of_pufs': 'the population only has {} PUFs'.format(population.size)})
+
+    def compile(self, version=None):
+        """
+        Return the immutable spec the PUFs of a run come from: the attached
+        population's, by default its current version, if there is one,
+        otherwise the generator's.
+        """
+        if self.population_id: return self.population.compile(version)
+        return self.puf_generator.compile()
+
+    @cached_property
+    def spec(self):
+        """
+        The compiled spec of this run. Shards only use the spec, so they make
+        no database queries, and it is pickled along to the workers.
+        """
+        return self.compile()
+
+    def generate_population(self, start, n, rng):
+        """
+        Return PUFs ``start`` to ``start + n`` of the run: from the attached
+        population if there is one, otherwise freshly generated.
+        """
+        if self.population_id:
+            return self.spec.get_population(start, n, rng)
+        return self.spec.generate_population(n, rng)
+
+    def get_shared_rng(self):
+        """
+        Return a generator that draws the same values in every shard of the
+        run, e.g. for a challenge set that all PUFs are evaluated on.
+        """
+        return np.random.default_rng(self.shared_seed)
+
+    def run_shard(self, start, n, rng):
+        """
+        Build and process PUFs ``start`` to ``start + n`` drawing from
+        ``rng``, and return a partial result that ``merge`` knows how to
+        combine.
+        """
+        raise NotImplementedError
+
+    def merge(self, partials, pufs):
+        """
+        Combine the partial results of the shards, in order, into a
+        ``Result`` for the ``pufs`` PUFs they simulated.
+        """
+        raise NotImplementedError
+
+    def get_interval(self, partials, pufs):
+        """
+        Return the half-width, in percentage points, of the confidence
+        interval of each bin of the estimate from the partial results of the
+        first ``pufs`` PUFs, or ``None`` if there is no such interval.
+        """
+        return None
+
+    def save_checkpoint(self, state):
+        self.checkpoint, self.checkpoint_meta = checkpoints.dumps(state)
+        self.checkpointed = timezone.now()
+        self.population_version = state['population_version']
+        type(self).objects.filter(pk=self.pk).update(checkpoint=self.checkpoint,
+            checkpoint_meta=self.checkpoint_meta, checkpointed=self.checkpointed,
+            population_version=self.population_version)
+
+    def get_fingerprint(self):
+        """
+        Return a digest of everything the result of a run depends on: the
+        settings of the analyzer and the compiled spec, which covers the
+        generator, its PDFs and the population file and version.
+        """
+        fields = [(f.attname, getattr(self, f.attname)) for f in self._meta.concrete_fields
+            if f.name not in self.state_fields and f.name not in self.fingerprint_exclude]
+        return hashlib.sha256(repr((fields, self.spec)).encode()).hexdigest()
+
+    def load_checkpoint(self, batches):
+        """
+        Return the checkpointed run state, or ``None`` if there is no
+        checkpoint or it was taken with different batches or a different
+        fingerprint, because the analyzer or its generator was edited since.
+        """
+        row = type(self).objects.filter(pk=self.pk).values_list('checkpoint', 'checkpoint_meta').first()
+        if not row or not row[0] or not row[1]: return None
+        state = checkpoints.loads(*row)
+        spec = self.spec
+        version = state.get('population_version')
+        if self.population_id and version != spec.version:
+            # continue on the chips the run started on; the population keeps
+            # the file of that version while the checkpoint refers to it
+            self.spec = self.compile(version)
+            if not os.path.exists(self.spec.path):
+                self.spec = spec
+                return None
+        if state['batches'] != batches or state.get('fingerprint') != self.get_fingerprint():
+            self.spec = spec
+            return None
+        return state
+
+    def run(self, resume=False, workers=None):
+        """
+        Split the pufs into shards, process them on a pool of workers (see
+        ``get_workers``) while updating progress, then merge the partial results and store them.
+        With a ``target_precision``, stop as soon as every bin is precise
+        enough.
+
+        Every ``PUFSIM_CHECKPOINT_INTERVAL`` seconds, the partial results and
+        the root seed of the shards are checkpointed. With ``resume``, the run
+        continues from the checkpoint and gives the same result as an
+        uninterrupted run.
+        """
+        self.spec = self.compile()
+        batches = list(self.get_batches(self.get_evaluations_per_puf()))
+        state = self.load_checkpoint(batches) if resume else None
+        if state is None:
+            entropy = np.random.SeedSequence(self.seed).entropy
+            state = {'entropy': entropy, 'batches': batches, 'partials': [],
+                'fingerprint': self.get_fingerprint(),
+                'population_version': getattr(self.spec, 'version', None)}
+        seeds = np.random.SeedSequence(state['entropy']).spawn(len(batches) + 1)
+        # the last seed is shared by all shards, see ``get_shared_rng``
+        self.shared_seed = seeds.pop()
+        partials = state['partials']
+        done = len(partials)
+        tasks = [(i, n, seed) for (i, n), seed in zip(batches, seeds)][done:]
+        reporter = ProgressReporter(self)
+        pufs = sum(n for i, n in batches[:done])
+        interval = get_setting('PUFSIM_CHECKPOINT_INTERVAL')
+        checkpointed = time.monotonic()
+        results = shards.map_shards(self, tasks, self.get_workers(workers))
+        try:
+            for (i, n), partial in zip(batches[done:], results):
+                partials.append(partial)
+                pufs = i + n
+                reporter.update(pufs*100 / self.number_of_pufs)
+                if self.target_precision and pufs < self.number_of_pufs:
+                    ci = self.get_interval(partials, pufs)
+                    if ci is not None and np.max(ci) <= self.target_precision: break
+                if interval and time.monotonic() - checkpointed >= interval:
+                    self.save_checkpoint(state)
+                    checkpointed = time.monotonic()
+        finally:
+            results.close()
+        self.checkpoint = None
+        self.checkpoint_meta = ''
+        self.checkpointed = None
+        self.population_version = None
+        self.progress = 100
+        result = self.merge(partials, pufs)
+        result.meta['pufs'] = pufs
+        if self.population_id:
+            result.meta['population'] = {'id': self.population_id, 'version': self.spec.version}
+        interval = self.get_interval(partials, pufs)
+        if interval is not None and np.all(np.isfinite(interval)):
+            result.arrays['interval'] = np.atleast_1d(interval)
+            result.meta['interval'] = float(np.max(interval))
+            result.meta['confidence'] = self.confidence_level
+        self.store_result(result)
+        self.save()
+        reporter.finish()
+        return result
+
+    def store_result(self, result):
+        self.result, self.result_meta = result.dumps()
+        self.result_digest = digest(self.result, self.result_meta)
+
+    def get_result(self):
+        """
+        Return the stored ``Result``, or ``None`` if there isn't one.
+        """
+        if not self.result_meta: return None
+        return Result.loads(self.result, self.result_meta)
+
     def get_data_display(self, graph_top=100):
         """
         Return a dictionary so the admin engine can render the data.
@@ -99,23 +438,40 @@ class ModelAnalyzer(models.Model):
         Return Dictionary:
          - type: The type of view that should render the data (valid values:
             'message', 'bar_graph')
-         - data: The object's ``data`` attribute
+         - data: The result as a ``{key: value}`` dictionary
+         - meta: Any other values from the result's metadata
+         - digest: The ``result_digest``, identifying the result's content
         """
-        try:
-            value = int(self.data)
+        result = self.get_result()
+        if result.meta['kind'] == 'count':
+            value = result.meta['count']
             msg = '{} {} returned {}, or %{}'
-            percent = 100 * value / self.number_of_pufs
+            percent = 100 * value / result.meta.get('pufs', self.number_of_pufs)
             cls = self.__class__.__name__
+            msg = msg.format(cls, str(self), value, percent)
+            if 'interval' in result.meta:
+                msg += ' +/- {:.2f} ({:.0%} confidence, {} PUFs)'.format(
+                    result.meta['interval'], result.meta['confidence'], result.meta['pufs'])
             return {
                 'type': 'message',
-                'msg': msg.format(cls, str(self), value, percent),
-            }
-        except ValueError:
-            return {
-                'type': 'bar_graph',
-                'data': self.data,
-                'graph_top': graph_top,
+                'msg': msg,
             }
+        return {
+            'type': 'bar_graph',
+            'data': result.as_dict(),
+            'meta': {k: v for k, v in result.meta.items() if k != 'kind'},
+            'digest': self.result_digest,
+            'graph_top': graph_top,
+        }
+
+
+    def get_summary(self, result):
+        """
+        Summarize ``result`` as one number, e.g. for a sweep overview.
+        """
+        if result.meta['kind'] == 'count':
+            return 100 * result.meta['count'] / result.meta.get('pufs', self.number_of_pufs)
+        return float(np.mean(result['values']))
 
 
 class BitflipAnalyzer(ModelAnalyzer):
@@ -126,6 +482,9 @@ class BitflipAnalyzer(ModelAnalyzer):
     puf_generator = models.ForeignKey(PUFGenerator, verbose_name='PUF generator', on_delete=models.CASCADE)
     base_challenge = models.IntegerField(default=0, help_text="Enter the challenge as a decimal value and the system will truncate or add zeros to the most significant bit side (e.g., 12 will be converted to 1100 and then padded to 001100 if the PUF has 6 stages)")
     number_of_pufs = models.IntegerField(default=100)
+    single_pass = models.BooleanField(default=True, help_text="Evaluate the base challenge once per PUF and compare every flipped response to it; otherwise the base challenge is evaluated again (with fresh noise) for each flip.")
+
+    summary_label = 'mean flip rate (%)'
 
     model_order = 1
 
@@ -135,29 +494,40 @@ class BitflipAnalyzer(ModelAnalyzer):
     def __str__(self):
         return self.name
 
-    def run(self):
-        """
-        Build pufs, process them while updating progress, return data.
-        """
-        data = {k: v for (k, v) in [(x, 0) for x in range(self.puf_generator.stages)]}
-        for i in range(self.number_of_pufs):
-            self.progress = int(i*100 / self.number_of_pufs)
-            self.save()
-            p = self.puf_generator.generate_puf()
-            for j in range(len(p.stages)):
-                c = p.get_bitstring(self.base_challenge)
-                # flip j'th bit
-                c_prime = c[:len(c)-j-1] + ('0' if c[len(c)-j-1] == '1' else '1') + c[len(c)-j:]
-                t1 = p.run(c)
-                t2 = p.run(c_prime)
-                if t1 != t2: data[j] += 1
-        self.progress = 100
-        self.data = data
-        self.save()
-        return data
+    def get_evaluations_per_puf(self):
+        if self.single_pass: return self.spec.stages + 1
+        return 2 * self.spec.stages
+
+    def run_shard(self, start, n, rng):
+        stages = self.spec.stages
+        if self.single_pass:
+            base = engine.Challenges.from_ints(self.base_challenge, stages)
+            r, flipped = self.generate_population(start, n, rng).evaluate_flips(base)
+            return (flipped != r[:, None]).sum(axis=0)
+        base = engine.Challenges.from_ints([self.base_challenge], stages)
+        # evaluate the base challenge once for each flipped challenge
+        challenges = engine.Challenges(np.concatenate([
+            np.repeat(base.words, stages, axis=0),
+            base.flips().words[0],
+        ]), stages)
+        r = self.generate_population(start, n, rng).evaluate(challenges)
+        return (r[:, :stages] != r[:, stages:]).sum(axis=0)
+
+    def merge(self, partials, pufs):
+        counts = np.zeros(self.spec.stages, dtype=int)
+        for partial in partials:
+            counts += partial
+        return Result.histogram(np.arange(len(counts)), counts)
+
+    def get_interval(self, partials, pufs):
+        return confidence.binomial_interval(sum(partials), pufs, self.confidence_level)
+
+    def get_summary(self, result):
+        return 100 * float(np.mean(result['values'])) / result.meta.get('pufs', self.number_of_pufs)
 
     def get_data_display(self, graph_top=100):
-        return super().get_data_display(graph_top=self.number_of_pufs)
+        pufs = self.get_result().meta.get('pufs', self.number_of_pufs)
+        return super().get_data_display(graph_top=pufs)
 
 
 class ChallengePairAnalyzer(ModelAnalyzer):
@@ -169,6 +539,8 @@ class ChallengePairAnalyzer(ModelAnalyzer):
     test_challenge = models.IntegerField(default=0, help_text="Enter the challenge as a decimal value and the system will truncate or add zeros to the most significant bit side (e.g., 12 will be converted to 1100 and then padded to 001100 if the PUF has 6 stages)")
     number_of_pufs = models.IntegerField(default=100)
 
+    summary_label = 'differing responses (%)'
+
     model_order = 2
 
     class Meta:
@@ -177,25 +549,20 @@ class ChallengePairAnalyzer(ModelAnalyzer):
     def __str__(self):
         return self.name
 
-    def run(self):
-        """
-        Build pufs, process them while updating progress, return data.
-        """
-        data = 0
-        for i in range(self.number_of_pufs):
-            print('doing {}'.format(i))
-            self.progress = int(i*100 / self.number_of_pufs)
-            self.save()
-            p = self.puf_generator.generate_puf()
-            c = p.get_bitstring(self.base_challenge)
-            c_prime = p.get_bitstring(self.test_challenge)
-            t1 = p.run(c)
-            t2 = p.run(c_prime)
-            if t1 != t2: data += 1
-        self.progress = 100
-        self.data = data
-        self.save()
-        return data
+    def get_evaluations_per_puf(self):
+        return 2
+
+    def run_shard(self, start, n, rng):
+        stages = self.spec.stages
+        challenges = engine.Challenges.from_ints([self.base_challenge, self.test_challenge], stages)
+        r = self.generate_population(start, n, rng).evaluate(challenges)
+        return int(np.count_nonzero(r[:, 0] != r[:, 1]))
+
+    def merge(self, partials, pufs):
+        return Result(kind='count', count=sum(partials))
+
+    def get_interval(self, partials, pufs):
+        return confidence.binomial_interval([sum(partials)], pufs, self.confidence_level)
 
 
 class NeighborPredictor(ModelAnalyzer):
@@ -215,6 +582,11 @@ class NeighborPredictor(ModelAnalyzer):
     iterations_per_puf = models.IntegerField(default=100)
     hop_by_power_of_two = models.BooleanField(default=False, help_text="Bins go from K to known_set_limit, if this option is checked, then go from 2^(K-1) to 2^(known_set_limit).")
 
+    # upper bound on the number of distances computed at once
+    block_distances = 2**22
+
+    summary_label = 'accuracy with the largest known set (%)'
+
     model_order = 3
 
     class Meta:
@@ -223,61 +595,75 @@ class NeighborPredictor(ModelAnalyzer):
     def __str__(self):
         return self.name
 
-    def run(self):
+    def get_bins(self):
         """
-        Build pufs, process them while updating progress, return data.
+        Return the known set sizes to build the histogram over.
         """
         if self.hop_by_power_of_two:
-            data = dict([(2**x, 0) for x in range(self.k, self.known_set_limit+1)])
-        else:
-            #data = [0 for x in range(self.known_set_limit+1)]
-            data = dict([(x, 0) for x in range(self.k, self.known_set_limit+1)])
-        for i in range(self.number_of_pufs):
-            self.progress = int(i*100 / self.number_of_pufs)
-            self.save()
-            p = self.puf_generator.generate_puf()
-            for k, bin in data.items():
-                # randomly generate k crps
-                crps = p.generate_random_crps(k)
-                for iter in range(self.iterations_per_puf):
-                    # randomly generate challenge
-                    ch = pl.generate_random_challenges(1, self.puf_generator.stages)[0]
-                    # order the set of CRPs
-                    ordered = [] # tuples of (distance, c, r)
-                    for (c, r) in crps:
-                        if self.distance == 'gamma':
-                            #ordered.append((pl.gamma(c, ch), c, r))
-                            ordered.append({'distance': pl.gamma(c, ch), 'challenge': c, 'response': r})
-                        else:
-                            #ordered.append((pl.hamming(c, ch), c, r))
-                            ordered.append({'distance': pl.hamming(c, ch), 'challenge': c, 'response': r})
-                    ordered.sort(key=lambda dict: abs(dict['distance']), reverse=True)
-                    # average k of them
-                    match_total = 0
-                    match_sum = 0
-                    r = self.k or k
-                    for n in range(r):
-                        match_total += 1
-                        bet = ordered[n]['response']
-                        if ordered[n]['distance'] < 0:
-                            bet = 0 if bet else 1
-                        match_sum += bet
-                    # average them and round
-                    try:
-                        prediction = match_sum / match_total
-                        prediction = 1 if prediction >= 0.5 else 0
-                    except ZeroDivisionError:
-                        prediction = np.random.choice([0, 1])
-                    # add to histogram if we successfully predicted the result
-                    true = p.run(ch)
-                    if prediction == true: data[k] += 1
-        self.progress = 100
+            return [2**x for x in range(self.k, self.known_set_limit+1)]
+        return list(range(self.k, self.known_set_limit+1))
+
+    def get_evaluations_per_puf(self):
+        bins = self.get_bins()
+        return sum(bins) + len(bins) * self.iterations_per_puf
+
+    def predict(self, known, responses, queries, k, rng):
+        """
+        Predict the responses to ``(P, Q, stages)`` queries from ``(P, K,
+        stages)`` known challenges and their ``(P, K)`` responses: each of the
+        ``k`` known challenges with the largest ``|distance|`` votes for its
+        response, inverted if the distance is negative.
+        """
+        d = engine.challenge_distances(queries, known, self.distance)
+        if not k: return rng.integers(2, size=d.shape[:-1])
+        # partial selection; ties go to the earlier known CRP, like a stable sort
+        n = d.shape[-1]
+        key = np.arange(n) - np.abs(d) * n
+        nearest = np.argpartition(key, k - 1, axis=-1)[..., :k]
+        votes = np.take_along_axis(np.broadcast_to(responses[:, None, :], d.shape), nearest, -1)
+        votes = votes ^ (np.take_along_axis(d, nearest, -1) < 0)
+        return (2 * votes.sum(-1) >= k).astype(np.uint8)
+
+    def run_shard(self, start, size, rng):
+        data = dict([(x, 0) for x in self.get_bins()])
+        stages = self.spec.stages
+        pop = self.generate_population(start, size, rng)
+        for k in data:
+            # randomly generate k crps per puf
+            known = engine.Challenges.random(k, stages, size=size, rng=rng)
+            responses = pop.evaluate(known)
+            # randomly generate the challenges to predict
+            queries = engine.Challenges.random(self.iterations_per_puf, stages, size=size, unique=False, rng=rng)
+            truth = pop.evaluate(queries)
+            # predict for blocks of PUFs to bound the size of the distance matrix
+            block = max(1, self.block_distances // max(1, k * self.iterations_per_puf))
+            for i in range(0, size, block):
+                s = slice(i, i + block)
+                prediction = self.predict(known[s], responses[s], queries[s], self.k or k, rng)
+                # add to histogram if we successfully predicted the result
+                data[k] += int((prediction == truth[s]).sum())
+        return data
+
+    def merge(self, partials, pufs):
+        data = self.get_successes(partials)
         for k, bin in data.items():
-            data[k] = 100*bin/(self.number_of_pufs*self.iterations_per_puf)
-        self.data = data
-        self.save()
+            data[k] = 100*bin/(pufs*self.iterations_per_puf)
+        return Result.histogram(list(data.keys()), list(data.values()))
+
+    def get_summary(self, result):
+        return float(result['values'][-1])
+
+    def get_successes(self, partials):
+        data = dict([(x, 0) for x in self.get_bins()])
+        for partial in partials:
+            for k, bin in partial.items():
+                data[k] += bin
         return data
 
+    def get_interval(self, partials, pufs):
+        successes = list(self.get_successes(partials).values())
+        return confidence.binomial_interval(successes, pufs*self.iterations_per_puf, self.confidence_level)
+
 
 class BiasTester(ModelAnalyzer):
     """
@@ -290,6 +676,8 @@ class BiasTester(ModelAnalyzer):
     number_of_pufs = models.IntegerField(default=100)
     n = models.IntegerField(default=100, help_text='How many samples to get for each PUF')
 
+    summary_label = 'mean bias (%)'
+
     model_order = 4
 
     class Meta:
@@ -298,29 +686,29 @@ class BiasTester(ModelAnalyzer):
     def __str__(self):
         return self.name
 
-    def run(self):
-        """
-        Build pufs, process them while updating progress, return data.
-        """
-        data = dict([(x, 0) for x in range(self.number_of_pufs)])
-        for i in range(self.number_of_pufs):
-            p = self.puf_generator.generate_puf()
-            c = pl.generate_random_challenges(self.n, self.puf_generator.stages)
-            current = 0
-            for j in range(len(c)):
-                self.progress = int(100*(1+j+i*self.n)/(self.number_of_pufs * self.n))
-                self.save()
-                if p.run(c[j]):
-                    current += 1
-            data[i] = 100*current / self.n
-        self.progress = 100
-        dataset = list(data.values())
-        data['meta'] = {}
-        data['meta']['mean_deviation'] = self.mean_deviation(dataset)
-        data['meta']['variance'] = self.variance(dataset)
-        self.data = data
-        self.save()
-        return data
+    def get_evaluations_per_puf(self):
+        return self.n
+
+    def run_shard(self, start, n, rng):
+        c = engine.Challenges.random(self.n, self.spec.stages, size=n, rng=rng)
+        r = self.generate_population(start, n, rng).evaluate(c)
+        return 100 * r.sum(axis=1) / self.n
+
+    def merge(self, partials, pufs):
+        biases = np.concatenate(partials) if partials else np.zeros(0)
+        dataset = biases.tolist()
+        return Result.histogram(np.arange(len(biases)), biases,
+            mean_deviation=self.mean_deviation(dataset),
+            variance=self.variance(dataset),
+        )
+
+    def get_interval(self, partials, pufs):
+        """
+        The per-PUF biases don't converge with more PUFs, so the interval is
+        that of the mean bias.
+        """
+        biases = np.concatenate(partials) if partials else np.zeros(0)
+        return confidence.mean_interval(biases, self.confidence_level)
 
     def mean_deviation(self, dataset):
         a = sum(dataset) / len(dataset)
@@ -329,3 +717,540 @@ class BiasTester(ModelAnalyzer):
     def variance(self, dataset):
         a = sum(dataset) / len(dataset)
         return sum([(x-a)**2 for x in dataset]) / len(dataset)
+
+
+class ReliabilityAnalyzer(ModelAnalyzer):
+    """
+    Keep each PUF fixed and evaluate a set of challenges many times with fresh
+    sample noise, measuring how far each sample is from the PUF's reference
+    response
+    """
+    puf_type_limit = models.Q(app_label = 'pufsim', model = 'pufgenerator') | models.Q(app_label = 'pufsim', model = 'compositepufgenerator')
+    puf_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, limit_choices_to=puf_type_limit)
+    puf_id = GfkLookupField('puf_type')
+    puf_generator = GenericForeignKey('puf_type', 'puf_id')
+    number_of_pufs = models.IntegerField(default=10)
+    challenges = models.IntegerField(default=1000, help_text='How many challenges to evaluate on each PUF')
+    samples = models.IntegerField(default=100, help_text='How many times each challenge is evaluated; the majority response of the samples is the reference')
+
+    # upper bound on the number of responses drawn at once
+    block_evaluations = 2**22
+
+    summary_label = 'mean bit error rate (%)'
+
+    model_order = 5
+
+    class Meta:
+        verbose_name = 'Reliability Analyzer'
+
+    def __str__(self):
+        return self.name
+
+    def get_evaluations_per_puf(self):
+        return self.samples * self.challenges
+
+    def run_shard(self, start, n, rng):
+        c = engine.Challenges.random(self.challenges, self.spec.stages, rng=rng)
+        pop = self.generate_population(start, n, rng)
+        r = np.empty((n, self.samples, self.challenges), dtype=np.uint8)
+        block = max(1, self.block_evaluations // (n * self.challenges))
+        for i in range(0, self.samples, block):
+            r[:, i:i+block] = pop.evaluate_repeated(c, min(block, self.samples - i))
+        reference = 2 * r.sum(axis=1, dtype=np.int64) >= self.samples
+        distances = (r != reference[:, None, :]).sum(axis=2)
+        percent = 100 * distances // self.challenges
+        return np.bincount(percent.ravel(), minlength=101), 100 * distances.mean(axis=1) / self.challenges
+
+    def merge(self, partials, pufs):
+        counts = sum(hist for hist, ber in partials)
+        ber = np.concatenate([ber for hist, ber in partials])
+        keys = np.arange(np.flatnonzero(counts).max() + 1)
+        result = Result.histogram(keys, 100 * counts[keys] / counts.sum(),
+            mean_ber=float(ber.mean()),
+            max_ber=float(ber.max()),
+        )
+        result.arrays['ber'] = ber
+        return result
+
+    def get_interval(self, partials, pufs):
+        """
+        The interval is that of the mean bit error rate, like for the
+        ``BiasTester``.
+        """
+        ber = np.concatenate([ber for hist, ber in partials])
+        return confidence.mean_interval(ber, self.confidence_level)
+
+    def get_summary(self, result):
+        return result.meta['mean_ber']
+
+
+class UniquenessAnalyzer(ModelAnalyzer):
+    """
+    Evaluate every PUF on the same set of challenges and find the Hamming
+    distances between the responses of every pair of PUFs
+    """
+    puf_type_limit = models.Q(app_label = 'pufsim', model = 'pufgenerator') | models.Q(app_label = 'pufsim', model = 'compositepufgenerator')
+    puf_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, limit_choices_to=puf_type_limit)
+    puf_id = GfkLookupField('puf_type')
+    puf_generator = GenericForeignKey('puf_type', 'puf_id')
+    number_of_pufs = models.IntegerField(default=1000)
+    challenges = models.IntegerField(default=128, help_text='How many challenges, shared by all PUFs, make up a response vector')
+
+    # rows of the pairwise distance tiles
+    distance_block = 256
+
+    summary_label = 'uniqueness (%)'
+
+    model_order = 6
+
+    class Meta:
+        verbose_name = 'Uniqueness Analyzer'
+
+    def __str__(self):
+        return self.name
+
+    def get_evaluations_per_puf(self):
+        return self.challenges
+
+    def run_shard(self, start, n, rng):
+        c = engine.Challenges.random(self.challenges, self.spec.stages, rng=self.get_shared_rng())
+        r = self.generate_population(start, n, rng).evaluate(c)
+        # pack the response vectors into words like challenges
+        return engine.Challenges.from_bits(r).words
+
+    def merge(self, partials, pufs):
+        words = np.concatenate(partials)
+        counts = engine.hamming_histogram(words, self.challenges, self.distance_block)
+        pairs = max(1, counts.sum())
+        distances = np.arange(len(counts))
+        mean = (distances * counts).sum() / pairs
+        std = np.sqrt(((distances - mean)**2 * counts).sum() / pairs)
+        # only keep the range of distances that occurred
+        nonzero = np.flatnonzero(counts)
+        keys = np.arange(nonzero.min(), nonzero.max() + 1) if len(nonzero) else distances[:1]
+        return Result.histogram(keys, 100 * counts[keys] / pairs,
+            uniqueness=float(100 * mean / self.challenges),
+            deviation=float(100 * std / self.challenges),
+            pairs=int(counts.sum()),
+        )
+
+    def get_summary(self, result):
+        return result.meta['uniqueness']
+
+    def get_data_display(self, graph_top=100):
+        values = self.get_result()['values']
+        return super().get_data_display(graph_top=float(values.max()) if len(values) else 100)
+
+
+class ModelingAttack(ModelAnalyzer):
+    """
+    Fit a logistic regression model to the CRPs of arbiter or XOR arbiter
+    PUFs and test how well it predicts the responses to new challenges, for
+    growing training sets
+    """
+    puf_type_limit = models.Q(app_label = 'pufsim', model = 'pufgenerator') | models.Q(app_label = 'pufsim', model = 'compositepufgenerator')
+    puf_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, limit_choices_to=puf_type_limit)
+    puf_id = GfkLookupField('puf_type')
+    puf_generator = GenericForeignKey('puf_type', 'puf_id')
+    number_of_pufs = models.IntegerField(default=10)
+    min_training_crps = models.IntegerField(default=1000, help_text='The smallest training set; it is doubled up to max_training_crps')
+    max_training_crps = models.IntegerField(default=100000)
+    test_crps = models.IntegerField(default=10000, help_text='How many new CRPs each model is tested on')
+    epochs = models.IntegerField(default=10, help_text='Passes over the training set; small training sets get more, so that every model has at least 1000 mini-batch updates')
+    batch_size = models.IntegerField(default=1000)
+    learning_rate = models.FloatField(default=0.05)
+
+    # training dominates the run time, so every PUF is a shard of its own
+    batch_evaluations = 1
+    # number of CRPs evaluated at once while generating the CRPs
+    chunk_crps = 2**16
+    # least number of mini-batch updates per model
+    min_steps = 1000
+
+    summary_label = 'accuracy with the largest training set (%)'
+
+    model_order = 7
+
+    class Meta:
+        verbose_name = 'Modeling Attack'
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        super().clean()
+        generator = self.puf_generator
+        if generator is not None:
+            spec = generator.compile()
+            if getattr(spec, 'child', spec).architecture != 'arbiter':
+                raise ValidationError({'puf_id': 'only arbiter and XOR arbiter PUFs can be attacked'})
+        if self.min_training_crps > self.max_training_crps:
+            raise ValidationError({'min_training_crps': 'must not be larger than max_training_crps'})
+
+    def get_training_sizes(self):
+        sizes = []
+        n = max(1, self.min_training_crps)
+        while n < self.max_training_crps:
+            sizes.append(n)
+            n *= 2
+        return sizes + [self.max_training_crps]
+
+    def get_evaluations_per_puf(self):
+        return self.max_training_crps + self.test_crps
+
+    def generate_crps(self, pop, n, rng):
+        """
+        Return ``n`` random packed challenges and the ``(P, n)`` responses of
+        ``pop``, evaluated ``chunk_crps`` at a time.
+        """
+        c = engine.Challenges.random(n, self.spec.stages, unique=False, rng=rng)
+        r = np.empty((len(pop), n), dtype=np.uint8)
+        for i in range(0, n, self.chunk_crps):
+            r[:, i:i+self.chunk_crps] = pop.evaluate(c[i:i+self.chunk_crps])
+        return c, r
+
+    def run_shard(self, start, n, rng):
+        levels = getattr(self.spec, 'levels', 1)
+        pop = self.generate_population(start, n, rng)
+        train, train_r = self.generate_crps(pop, self.max_training_crps, rng)
+        test, test_r = self.generate_crps(pop, self.test_crps, rng)
+        sizes = self.get_training_sizes()
+        successes = np.zeros(len(sizes), dtype=np.int64)
+        for p in range(n):
+            for i, size in enumerate(sizes):
+                w = learning.fit(train[:size], train_r[p, :size], levels, self.epochs,
+                    self.batch_size, self.learning_rate, self.min_steps, rng)
+                successes[i] += np.count_nonzero(learning.predict(w, test) == test_r[p])
+        return successes
+
+    def merge(self, partials, pufs):
+        accuracy = 100 * sum(partials) / (pufs * self.test_crps)
+        return Result.histogram(self.get_training_sizes(), accuracy)
+
+    def get_summary(self, result):
+        return float(result['values'][-1])
+
+    def get_interval(self, partials, pufs):
+        return confidence.binomial_interval(sum(partials), pufs * self.test_crps, self.confidence_level)
+
+
+class Sweep(models.Model):
+    """
+    Run copies of an analyzer over a grid of generator parameters and combine
+    their results
+    """
+    name = models.CharField(max_length=255)
+    analyzer_limit = models.Q(app_label='pufsim_analysis') & ~models.Q(model__in=['job', 'sweep'])
+    analyzer_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, limit_choices_to=analyzer_limit)
+    analyzer_id = GfkLookupField('analyzer_type', help_text='The analyzer to copy for every point of the grid; its generator is the base of the sweep.')
+    analyzer = GenericForeignKey('analyzer_type', 'analyzer_id')
+    grid = models.TextField(default='{}', help_text='JSON object mapping generator parameters to lists of values, e.g. {"stages": [16, 32, 64], "production_pdf.sigma": [0.1, 0.5]}. Composite generators also take "levels".')
+    seed = models.PositiveIntegerField(blank=True, null=True, help_text='Seed shared by every point, so they simulate the same random draws; leave blank to pick one at random.')
+    points = models.TextField(blank=True, editable=False)
+    result = models.BinaryField(blank=True, null=True, editable=False)
+    result_meta = models.TextField(blank=True, editable=False)
+    result_digest = models.CharField(max_length=64, blank=True, editable=False)
+
+    model_order = 8
+
+    class Meta:
+        verbose_name = 'Sweep'
+
+    def __str__(self):
+        return self.name
+
+    def get_axes(self):
+        """
+        Return the grid as a list of ``(parameter, values)`` tuples.
+        """
+        return list(json.loads(self.grid).items())
+
+    def clean(self):
+        try:
+            grid = json.loads(self.grid)
+        except ValueError as e:
+            raise ValidationError({'grid': 'invalid JSON: {}'.format(e)})
+        if not isinstance(grid, dict) or not grid:
+            raise ValidationError({'grid': 'expected an object of parameters'})
+        analyzer = self.analyzer
+        if analyzer is None:
+            raise ValidationError({'analyzer_id': 'no such analyzer'})
+        allowed = analyzer.puf_generator.sweep_parameters
+        for k, values in grid.items():
+            if k not in allowed:
+                raise ValidationError({'grid': '{} is not one of {}'.format(k, ', '.join(allowed))})
+            if not isinstance(values, list) or not values or not all(isinstance(v, (int, float)) for v in values):
+                raise ValidationError({'grid': '{} must be a non-empty list of numbers'.format(k)})
+
+    def get_points(self):
+        return json.loads(self.points) if self.points else []
+
+    def get_analyzers(self, payload=False):
+        """
+        Return the analyzers of the points by primary key, with their results
+        only if ``payload``.
+        """
+        model = self.analyzer_type.model_class()
+        pks = set(p['analyzer'] for p in self.get_points())
+        deferred = ['checkpoint', 'checkpoint_meta']
+        if not payload: deferred += ['result', 'result_meta']
+        return {a.pk: a for a in model.objects.defer(*deferred).filter(pk__in=pks)}
+
+    def enqueue(self, owner=None, priority=0):
+        """
+        Queue an analyzer for every point of the grid. The first run creates
+        them: points that come out as the same generator (e.g. parameters the
+        distribution ignores) share one analyzer, generators and PDFs are
+        reused where they already exist, and every point uses the same seed,
+        so points that only differ in noise or sensitivity simulate the same
+        chips. Later runs queue the same analyzers again, unless the grid
+        changed. Return the number of analyzers.
+        """
+        axes = self.get_axes()
+        names = [k for k, values in axes]
+        grid = [dict(zip(names, values)) for values in itertools.product(*[values for k, values in axes])]
+        points = self.get_points()
+        existing = self.get_analyzers() if points else {}
+        if points and [p['params'] for p in points] == grid and all(p['analyzer'] in existing for p in points):
+            for analyzer in existing.values():
+                analyzer.enqueue(owner=owner, priority=priority)
+            return self.reset(points, len(existing))
+        template = self.analyzer
+        base = template.puf_generator
+        if self.seed is None:
+            self.seed = int(np.random.SeedSequence().generate_state(1)[0] >> 1)
+        points = []
+        analyzers = {}
+        for params in grid:
+            label = ', '.join('{}={}'.format(k, v) for k, v in params.items())
+            generator = base.derive(params, name='{} ({})'.format(base.name, label))
+            key = (type(generator), generator.pk)
+            if key not in analyzers:
+                analyzer = template.copy(name='{} ({})'.format(self.name, label),
+                    puf_generator=generator, seed=self.seed, population=None)
+                analyzer.enqueue(owner=owner, priority=priority)
+                analyzers[key] = analyzer.pk
+            points.append({'params': params, 'analyzer': analyzers[key]})
+        return self.reset(points, len(analyzers))
+
+    def reset(self, points, n):
+        """
+        Store the ``points`` of a new run, clearing the old result, and
+        return ``n``.
+        """
+        self.points = json.dumps(points)
+        self.result = None
+        self.result_meta = ''
+        self.result_digest = ''
+        self.save()
+        return n
+
+    def get_progress(self):
+        analyzers = self.get_analyzers().values()
+        if not analyzers: return 0
+        return int(sum(a.get_progress() for a in analyzers) / len(analyzers))
+    get_progress.short_description = 'progress'
+
+    def get_status(self):
+        """
+        Return 'new' before the first run, 'done' once every point is done,
+        'failed' if any point failed, and 'running' otherwise. This takes two
+        queries however many points there are.
+        """
+        if self.result_meta: return 'done'
+        analyzers = self.get_analyzers()
+        if not analyzers: return 'new'
+        latest = self.analyzer_type.model_class().get_latest_states(list(analyzers))
+        states = set(a.get_status(latest) for a in analyzers.values())
+        if states == {'done'}: return 'done'
+        return 'failed' if 'failed' in states else 'running'
+    get_status.short_description = 'status'
+
+    def get_operations(self):
+        status = self.get_status()
+        ops = [] if status == 'running' else ['Run']
+        if status == 'done': ops.append('ShowData')
+        return ops
+
+    @classmethod
+    def get_all_operations(cls):
+        return ['Run', 'ShowData']
+
+    def store_result(self, result):
+        self.result, self.result_meta = result.dumps()
+        self.result_digest = digest(self.result, self.result_meta)
+
+    def get_result(self):
+        if not self.result_meta: return None
+        return Result.loads(self.result, self.result_meta)
+
+    def collect(self):
+        """
+        Combine the results of the points into one ``Result`` once they are
+        all done, and return it (or ``None`` before then). The ``summary``
+        array holds ``get_summary`` of every point and ``values`` the full
+        histograms, padded with NaN, with one axis per parameter
+        (``axis0``, ``axis1``...) in the order of the grid.
+        """
+        if self.result_meta: return self.get_result()
+        if self.get_status() != 'done': return None
+        analyzers = self.get_analyzers(payload=True)
+        axes = self.get_axes()
+        shape = tuple(len(values) for k, values in axes)
+        results = {pk: a.get_result() for pk, a in analyzers.items()}
+        bins = max((len(r['values']) for r in results.values() if r.meta['kind'] == 'histogram'), default=0)
+        summary = np.full(shape, np.nan)
+        values = np.full(shape + (bins,), np.nan)
+        for index, point in zip(np.ndindex(*shape), self.get_points()):
+            analyzer = analyzers[point['analyzer']]
+            result = results[point['analyzer']]
+            summary[index] = analyzer.get_summary(result)
+            if result.meta['kind'] == 'histogram':
+                values[index][:len(result['values'])] = result['values']
+        arrays = {'summary': summary, 'values': values}
+        for i, (k, v) in enumerate(axes):
+            arrays['axis{}'.format(i)] = np.asarray(v)
+        result = Result(arrays, kind='sweep', parameters=[k for k, v in axes],
+            summary=type(self.analyzer).summary_label)
+        self.store_result(result)
+        self.save()
+        return result
+
+    def get_data_display(self, graph_top=100):
+        """
+        Return a line graph of the summary over the first parameter, with one
+        line for every combination of the others.
+        """
+        result = self.collect()
+        axes = self.get_axes()
+        xs = axes[0][1]
+        series = {}
+        data = {}
+        for index in np.ndindex(*result['summary'].shape[1:]):
+            label = ', '.join('{}={}'.format(k, v[i]) for (k, v), i in zip(axes[1:], index)) or self.name
+            ys = result['summary'][(slice(None),) + index].tolist()
+            series[label] = (xs, ys)
+        for point, value in zip(self.get_points(), result['summary'].ravel().tolist()):
+            data[', '.join('{}={}'.format(k, v) for k, v in point['params'].items())] = value
+        return {
+            'type': 'line_graph',
+            'series': series,
+            'data': data,
+            'meta': {},
+            'xlabel': axes[0][0],
+            'ylabel': result.meta['summary'],
+            'digest': self.result_digest,
+        }
+
+
+class Job(models.Model):
+    """
+    A queued run of an analyzer, or Quicktest of a PUF generator, picked up
+    by a ``pufsim_worker`` process
+    """
+    analyzer_limit = (models.Q(app_label='pufsim_analysis') & ~models.Q(model__in=['job', 'sweep'])
+        | models.Q(app_label='pufsim', model='pufgenerator'))
+    analyzer_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, limit_choices_to=analyzer_limit)
+    analyzer_id = models.PositiveIntegerField()
+    analyzer = GenericForeignKey('analyzer_type', 'analyzer_id')
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, blank=True, null=True, on_delete=models.SET_NULL)
+    priority = models.IntegerField(default=0, help_text='Queued jobs with a higher priority are run first.')
+    resume = models.BooleanField(default=False, help_text='Continue from the analyzer\'s last checkpoint.')
+    kinds = [
+        ('run', 'run'),
+        ('quicktest', 'quicktest'),
+    ]
+    kind = models.CharField(max_length=30, choices=kinds, default='run', help_text='What to do: run the analyzer, or Quicktest the PUF generator.')
+    states = [
+        ('queued', 'queued'),
+        ('running', 'running'),
+        ('done', 'done'),
+        ('failed', 'failed'),
+    ]
+    state = models.CharField(max_length=30, choices=states, default='queued', db_index=True)
+    worker = models.CharField(max_length=255, blank=True, editable=False)
+    error = models.TextField(blank=True, editable=False)
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(blank=True, null=True, editable=False)
+    finished = models.DateTimeField(blank=True, null=True, editable=False)
+
+    model_order = 9
+
+    class Meta:
+        verbose_name = 'Job'
+        indexes = [models.Index(fields=['analyzer_type', 'analyzer_id'])]
+
+    def __str__(self):
+        return '{} {} ({})'.format(self.analyzer_type.model, self.analyzer_id, self.state)
+
+    def clean(self):
+        if not self.analyzer_type_id: return
+        if (self.kind == 'quicktest') != (self.analyzer_type.model_class() is PUFGenerator):
+            raise ValidationError({'kind': 'only PUF generators have a quicktest, and only analyzers run'})
+
+    @classmethod
+    def claim(cls, worker):
+        """
+        Atomically take the next queued job for ``worker``, or return ``None``
+        if the queue is empty or ``PUFSIM_MAX_RUNNING_JOBS`` are running.
+
+        Scheduling is fair between owners: the next job comes from the owner
+        with the fewest running jobs, then by priority, then oldest first.
+
+        The cap is checked in the same ``UPDATE`` that claims the job. SQLite
+        runs one write at a time, so that enforces it; on databases with
+        concurrent writes (e.g. PostgreSQL under ``READ COMMITTED``) two
+        workers claiming at the same moment can still both pass it.
+        """
+        with transaction.atomic():
+            running = cls.objects.select_for_update().filter(state='running')
+            running = Counter(running.values_list('owner', flat=True))
+            limit = get_setting('PUFSIM_MAX_RUNNING_JOBS')
+            if limit and sum(running.values()) >= limit: return None
+            queued = cls.objects.filter(state='queued').order_by('-priority', 'created')
+            owners = queued.order_by().values_list('owner', flat=True).distinct()
+            candidates = [queued.filter(owner=owner).first() for owner in owners]
+            candidates = [c for c in candidates if c]
+            if not candidates: return None
+            job = min(candidates, key=lambda c: (running[c.owner_id], -c.priority, c.created))
+            claimed = cls.objects.filter(pk=job.pk, state='queued')
+            if limit:
+                # count the running jobs again within the update itself
+                count = cls.objects.filter(state='running').order_by().values('state').annotate(
+                    n=models.Count('pk')).values('n')
+                current = Coalesce(models.Subquery(count), 0, output_field=models.IntegerField())
+                claimed = claimed.annotate(running=current).filter(running__lt=limit)
+            claimed = claimed.update(state='running', worker=worker, started=timezone.now())
+            if not claimed: return None
+            job.refresh_from_db()
+            return job
+
+    def execute(self, workers=None):
+        """
+        Run the analyzer, marking it as running under this process, on
+        ``workers`` shard processes unless the analyzer sets its own, or run
+        the Quicktest. If the worker is interrupted, e.g. by Ctrl-C or
+        ``SIGTERM``, the job is failed before the interrupt is passed on, so
+        the analyzer can be queued again.
+        """
+        try:
+            if self.kind == 'quicktest':
+                quicktest.execute(self.analyzer)
+            else:
+                with self.analyzer.running() as analyzer:
+                    analyzer.run(resume=self.resume, workers=workers)
+            self.state = 'done'
+        except Exception:
+            self.state = 'failed'
+            self.error = traceback.format_exc()
+        except BaseException:
+            self.state = 'failed'
+            self.error = 'worker interrupted\n' + traceback.format_exc()
+            raise
+        finally:
+            self.finished = timezone.now()
+            self.save()
+
+
+def get_analyzer_models():
+    return [m for m in apps.get_app_config('pufsim_analysis').get_models() if issubclass(m, ModelAnalyzer)]
@@ -0,0 +1,84 @@
+"""
+Lightweight progress reporting for running analyzers.
+
+Rather than saving the whole analyzer row every time progress moves, a
+``ProgressReporter`` only publishes when progress has moved by at least
+``PUFSIM_PROGRESS_STEP`` percent or ``PUFSIM_PROGRESS_INTERVAL`` seconds have
+passed since the last publish. Progress is published either as a single
+column ``UPDATE`` or, with ``PUFSIM_PROGRESS_BACKEND = 'cache'``, to Django's
+cache framework so running analyzers don't write to the database at all.
+Unless that cache is shared between processes, progress goes to the database
+anyway, since the server couldn't read it.
+"""
+from django.core.cache import caches
+import time
+
+from pufsim.checks import is_shared_cache
+from pufsim.settings import get_setting
+
+
+def get_backend():
+    """
+    Return the progress backend to use, 'db' or 'cache'.
+    """
+    backend = get_setting('PUFSIM_PROGRESS_BACKEND')
+    if backend == 'cache' and not is_shared_cache(get_setting('PUFSIM_PROGRESS_CACHE')):
+        return 'db'
+    return backend
+
+
+def get_cache_key(analyzer):
+    return 'pufsim:progress:{}:{}'.format(analyzer._meta.label_lower, analyzer.pk)
+
+
+def get_cached_progress(analyzer):
+    """
+    Return the progress published to the cache for ``analyzer``, or ``None``.
+    """
+    cache = caches[get_setting('PUFSIM_PROGRESS_CACHE')]
+    return cache.get(get_cache_key(analyzer))
+
+
+class ProgressReporter:
+    """
+    Throttled publisher for the progress of one analyzer.
+    """
+
+    def __init__(self, analyzer, step=None, interval=None, backend=None):
+        self.analyzer = analyzer
+        self.step = get_setting('PUFSIM_PROGRESS_STEP') if step is None else step
+        self.interval = get_setting('PUFSIM_PROGRESS_INTERVAL') if interval is None else interval
+        self.backend = backend or get_backend()
+        self.last_progress = analyzer.progress
+        self.last_time = time.monotonic()
+
+    def update(self, progress):
+        """
+        Record ``progress`` and publish it if it is due.
+        """
+        progress = int(progress)
+        self.analyzer.progress = progress
+        if progress == self.last_progress:
+            return
+        now = time.monotonic()
+        moved = abs(progress - self.last_progress) >= self.step
+        if moved or now - self.last_time >= self.interval:
+            self.publish(progress)
+            self.last_progress = progress
+            self.last_time = now
+
+    def publish(self, progress):
+        if self.backend == 'cache':
+            cache = caches[get_setting('PUFSIM_PROGRESS_CACHE')]
+            cache.set(get_cache_key(self.analyzer), progress, None)
+        else:
+            model = type(self.analyzer)
+            model.objects.filter(pk=self.analyzer.pk).update(progress=progress)
+
+    def finish(self):
+        """
+        Drop any published progress once the analyzer has saved its result.
+        """
+        if self.backend == 'cache':
+            cache = caches[get_setting('PUFSIM_PROGRESS_CACHE')]
+            cache.delete(get_cache_key(self.analyzer))
@@ -0,0 +1,68 @@
+"""
+Compact storage for analyzer results.
+
+A result is a set of named NumPy arrays plus a small JSON metadata dict. The
+arrays are stored as a compressed ``.npz`` blob in the analyzer's ``result``
+column and the metadata as JSON in ``result_meta``, so listing analyzers or
+checking whether a result exists never needs to read the payload, and the
+payload is parsed with ``np.load`` rather than ``eval``.
+
+Histogram-like results use the arrays ``keys`` and ``values``.
+"""
+import hashlib
+from io import BytesIO
+import json
+
+from pufsim.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+
+def digest(blob, meta_json):
+    """
+    Return a hex digest identifying the content of a stored result.
+    """
+    h = hashlib.sha256(meta_json.encode())
+    h.update(bytes(blob or b''))
+    return h.hexdigest()
+
+
+class Result:
+    """
+    Named arrays plus JSON-serializable metadata.
+    """
+
+    def __init__(self, arrays=None, **meta):
+        self.arrays = arrays if arrays is not None else {}
+        self.meta = meta
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    @classmethod
+    def histogram(cls, keys, values, **meta):
+        arrays = {'keys': np.asarray(keys), 'values': np.asarray(values)}
+        return cls(arrays, kind='histogram', **meta)
+
+    def dumps(self):
+        """
+        Return ``(blob, meta_json)`` for storage.
+        """
+        b = BytesIO()
+        np.savez_compressed(b, **self.arrays)
+        return b.getvalue(), json.dumps(self.meta, sort_keys=True)
+
+    @classmethod
+    def loads(cls, blob, meta_json):
+        """
+        Load a stored result. Arrays are only decompressed when accessed.
+        """
+        meta = json.loads(meta_json)
+        arrays = np.load(BytesIO(bytes(blob))) if blob else {}
+        return cls(arrays, **meta)
+
+    def as_dict(self):
+        """
+        Return a histogram result as a plain ``{key: value}`` dict.
+        """
+        return dict(zip(self['keys'].tolist(), self['values'].tolist()))
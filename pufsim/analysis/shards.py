@@ -0,0 +1,47 @@
+"""
+Process pool helpers for running analyzer shards in parallel.
+
+This module must stay importable without Django being set up, since worker
+processes may be started with the ``spawn`` method and import it before
+anything else.
+"""
+import multiprocessing
+import numpy as np
+import pickle
+
+
+_analyzer = None
+
+
+def _init_worker(payload):
+    global _analyzer
+    from django.apps import apps
+    if not apps.ready:
+        import django
+        django.setup()
+    _analyzer = pickle.loads(payload)
+
+
+def _run_shard(task):
+    start, n, seed = task
+    return _analyzer.run_shard(start, n, np.random.default_rng(seed))
+
+
+def map_shards(analyzer, tasks, workers=1):
+    """
+    Yield ``analyzer.run_shard(start, n, rng)`` for each ``(start, n, seed)``
+    task, in order, using a pool of ``workers`` processes. Each shard draws
+    from its own ``SeedSequence``, so the results do not depend on the worker
+    count.
+    """
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        for start, n, seed in tasks:
+            yield analyzer.run_shard(start, n, np.random.default_rng(seed))
+        return
+    # don't share database connections with the forked workers
+    from django.db import connections
+    connections.close_all()
+    payload = pickle.dumps(analyzer)
+    with multiprocessing.Pool(workers, _init_worker, (payload,)) as pool:
+        yield from pool.imap(_run_shard, tasks)
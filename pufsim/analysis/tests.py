@@ -0,0 +1,420 @@
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+import os
+import tempfile
+from unittest import mock
+import numpy as np
+import puflib as pl
+
+from pufsim import checks, engine, quicktest, specs
+from pufsim.models import PDF, PUFGenerator, PUFPopulation
+from . import checkpoints, models
+
+
+def puflib_stages(gates, sample_rng=None):
+    """
+    Return ``puflib`` stages with the ``(stages, 4)`` gate delays ``gates``.
+    """
+    gate = lambda delay: pl.Gate(delay, sample_rng=sample_rng)
+    return [pl.Stage(pl.Mux(gate(uu), gate(ud)), pl.Mux(gate(du), gate(dd)))
+        for uu, ud, du, dd in gates.tolist()]
+
+
+class EngineTest(SimpleTestCase):
+    """
+    The vectorized populations against ``puflib`` and explicit evaluation.
+    """
+
+    def setUp(self):
+        self.rng = np.random.default_rng(1)
+        self.gates = self.rng.normal(10, 1, (5, 16, 4))
+        self.bits = engine.random_challenges(200, 16, rng=self.rng)
+        self.strings = engine.bits_to_strings(self.bits)
+
+    def test_arbiter_matches_puflib(self):
+        r = engine.ArbiterPopulation.from_gates(self.gates).evaluate(self.bits)
+        for p, gates in enumerate(self.gates):
+            puf = pl.Arbiter(puflib_stages(gates), sensitivity=0)
+            self.assertEqual(r[p].tolist(), puf.run_set(self.strings))
+
+    def test_loop_matches_puflib(self):
+        # the same chips as puflib builds from the same seed
+        spec = specs.GeneratorSpec('loop', 16, 0.0, specs.PDFSpec('normal', 10, 1),
+            specs.PDFSpec('dirac', 0.25))
+        pop = spec.generate_population(5, np.random.default_rng(2))
+        np.random.seed(np.random.default_rng(2).integers(2**32))
+        pufs = [spec.generate_puf() for i in range(5)]
+        gates = [[[g.delay for m in s.muxes for g in m.gates] for s in puf.stages] for puf in pufs]
+        self.assertEqual(pop.gates.tolist(), gates)
+        # the same responses, summing the sampled delays in the same order
+        r = pop.evaluate(self.bits)
+        for p, gates in enumerate(pop.gates):
+            puf = pl.Loop(puflib_stages(gates, lambda: 0.25), sensitivity=0)
+            self.assertEqual(r[p].tolist(), puf.run_set(self.strings))
+
+    def test_xor_matches_puflib(self):
+        gates = self.gates.reshape(5, 1, 16, 4) + self.rng.normal(0, 1, (5, 4, 16, 4))
+        pop = engine.XorArbiterPopulation.from_gates(gates)
+        r = pop.evaluate(self.bits)
+        for p, levels in enumerate(gates):
+            # ``pl.Xor.run`` expects bitstring responses, which ``pl.Arbiter`` doesn't give
+            children = [pl.Arbiter(puflib_stages(g), sensitivity=0).run_set(self.strings) for g in levels]
+            self.assertEqual(r[p].tolist(), np.bitwise_xor.reduce(children).tolist())
+        base, flips = pop.evaluate_flips(self.bits[0])
+        self.assertEqual(flips.tolist(), pop.evaluate(self.bits[0] ^ np.eye(16, dtype=np.uint8)).tolist())
+
+    def test_flips_match_evaluation(self):
+        challenge = self.bits[0]
+        flipped = challenge ^ np.eye(16, dtype=np.uint8)
+        arbiter = engine.ArbiterPopulation.from_gates(self.gates)
+        loop = engine.LoopPopulation(self.gates)
+        for pop in [arbiter, loop, engine.XorPopulation(arbiter.split(1) + loop.split(1))]:
+            base, flips = pop.evaluate_flips(challenge)
+            self.assertEqual(base.tolist(), pop.evaluate(challenge[None])[:, 0].tolist())
+            self.assertEqual(flips.tolist(), pop.evaluate(flipped).tolist())
+
+    def test_distances_match_puflib(self):
+        queries, known = self.bits[:20], self.bits[20:50]
+        q, k = engine.bits_to_strings(queries), engine.bits_to_strings(known)
+        for metric, distance in [('gamma', pl.gamma), ('hamming', pl.hamming)]:
+            expected = [[distance(c, ch) for c in k] for ch in q]
+            d = engine.challenge_distances(queries, known, metric)
+            self.assertEqual(d.tolist(), expected)
+            packed = engine.challenge_distances(engine.Challenges.from_bits(queries),
+                engine.Challenges.from_bits(known), metric)
+            self.assertEqual(packed.tolist(), expected)
+
+    def predict_loop(self, known, responses, queries, k, metric):
+        """
+        The per-query loop ``NeighborPredictor`` used to predict with.
+        """
+        distance = pl.gamma if metric == 'gamma' else pl.hamming
+        predictions = []
+        for cs, rs, qs in zip(engine.bits_to_strings(known), responses.tolist(),
+                engine.bits_to_strings(queries)):
+            predictions.append([])
+            for ch in qs:
+                ordered = sorted([(distance(c, ch), r) for c, r in zip(cs, rs)],
+                    key=lambda x: abs(x[0]), reverse=True)
+                bets = [1 - r if d < 0 else r for d, r in ordered[:k]]
+                predictions[-1].append(1 if sum(bets) / k >= 0.5 else 0)
+        return predictions
+
+    def test_neighbors_match_loop(self):
+        # few stages, so many distances tie
+        known = engine.random_challenges(12, 6, size=4, rng=self.rng)
+        queries = engine.random_challenges(30, 6, size=4, unique=False, rng=self.rng)
+        responses = self.rng.integers(2, size=(4, 12)).astype(np.uint8)
+        for metric in ['gamma', 'hamming']:
+            predictor = models.NeighborPredictor(distance=metric)
+            for k in [1, 2, 3, 12]:
+                prediction = predictor.predict(engine.Challenges.from_bits(known), responses,
+                    engine.Challenges.from_bits(queries), k, self.rng)
+                self.assertEqual(prediction.tolist(),
+                    self.predict_loop(known, responses, queries, k, metric))
+
+
+class StartupTest(SimpleTestCase):
+
+    def test_run_analyzer_startup(self):
+        # fails with a CommandError if the median is over PUFSIM_STARTUP_BUDGET
+        out = StringIO()
+        call_command('check_startup', runs=3, stdout=out)
+        self.assertIn('run_analyzer startup', out.getvalue())
+
+
+class ShardTest(TestCase):
+
+    def test_workers(self):
+        pdf = PDF.objects.create(name='p', distribution='normal', mean=10, sigma=1)
+        noise = PDF.objects.create(name='s', distribution='normal', mean=0, sigma=0.5)
+        generator = PUFGenerator.objects.create(name='g', architecture='arbiter',
+            stages=16, production_pdf=pdf, sample_pdf=noise, sensitivity=0.1)
+        analyzer = models.BiasTester.objects.create(name='bias', seed=1,
+            puf_type=ContentType.objects.get_for_model(generator), puf_id=generator.pk,
+            number_of_pufs=40, n=50)
+        with mock.patch.object(models.BiasTester, 'batch_evaluations', 500):
+            results = [analyzer.copy(workers=workers).run().dumps() for workers in (1, 2, 3)]
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+
+
+class BitflipTest(TestCase):
+
+    def test_single_pass_without_noise(self):
+        pdf = PDF.objects.create(name='p', distribution='normal', mean=10, sigma=1)
+        dirac = PDF.objects.create(name='d', distribution='dirac', mean=0)
+        generator = PUFGenerator.objects.create(name='g', architecture='arbiter',
+            stages=16, production_pdf=pdf, sample_pdf=dirac, sensitivity=0)
+        analyzer = models.BitflipAnalyzer.objects.create(name='bf', puf_generator=generator,
+            base_challenge=12345, number_of_pufs=200, seed=1, workers=1)
+        single = analyzer.copy(single_pass=True).run()
+        self.assertEqual(single['values'].tolist(), analyzer.copy(single_pass=False).run()['values'].tolist())
+        self.assertGreater(single['values'].sum(), 0)
+
+
+@override_settings(PUFSIM_CHECKPOINT_INTERVAL=1e-9)
+class CheckpointTest(TestCase):
+
+    def setUp(self):
+        pdf = PDF.objects.create(name='p', distribution='normal', mean=10, sigma=1)
+        noise = PDF.objects.create(name='s', distribution='normal', mean=0, sigma=0.5)
+        generator = PUFGenerator.objects.create(name='g', architecture='arbiter',
+            stages=16, production_pdf=pdf, sample_pdf=noise)
+        self.analyzer = models.ChallengePairAnalyzer.objects.create(name='cp',
+            puf_generator=generator, base_challenge=1, test_challenge=2,
+            number_of_pufs=1000, seed=1, workers=1)
+
+    def crash(self):
+        """
+        Run the analyzer until just before it stores the result, leaving a
+        checkpoint of all its batches behind.
+        """
+        with mock.patch.object(models.ChallengePairAnalyzer, 'merge', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.analyzer.run()
+        return models.ChallengePairAnalyzer.objects.get(pk=self.analyzer.pk)
+
+    def fresh_count(self, **fields):
+        return self.analyzer.copy(**fields).run().meta['count']
+
+    def test_resume(self):
+        analyzer = self.crash()
+        analyzer.name = 'renamed'
+        self.assertEqual(analyzer.run(resume=True).meta['count'], self.fresh_count())
+
+    def test_resume_after_edit(self):
+        analyzer = self.crash()
+        analyzer.test_challenge = 12345
+        analyzer.save()
+        count = analyzer.run(resume=True).meta['count']
+        self.assertEqual(count, self.fresh_count(test_challenge=12345))
+        self.assertNotEqual(count, self.fresh_count(test_challenge=2))
+
+    def test_checkpoint_storage(self):
+        analyzer = self.crash()
+        self.assertTrue(bytes(analyzer.checkpoint).startswith(b'PK'))
+        state = {'entropy': 2**100, 'batches': [(0, 10), (10, 5)], 'version': None,
+            'partials': [3, {1: 2}, (np.arange(3), np.ones(2, dtype=np.uint64))]}
+        loaded = checkpoints.loads(*checkpoints.dumps(state))
+        self.assertEqual(loaded['entropy'], 2**100)
+        self.assertEqual(loaded['batches'], [(0, 10), (10, 5)])
+        self.assertEqual(loaded['partials'][:2], [3, {1: 2}])
+        np.testing.assert_array_equal(loaded['partials'][2][1], np.ones(2, dtype=np.uint64))
+        self.assertEqual(loaded['partials'][2][1].dtype, np.uint64)
+        with self.assertRaises(TypeError):
+            checkpoints.dumps({'partials': [object()]})
+
+    def test_resume_after_generator_edit(self):
+        analyzer = self.crash()
+        analyzer.puf_generator.sample_pdf.sigma = 5
+        analyzer.puf_generator.sample_pdf.save()
+        self.assertIsNone(analyzer.load_checkpoint(list(analyzer.get_batches(
+            analyzer.get_evaluations_per_puf()))))
+
+
+class JobTest(TestCase):
+
+    def setUp(self):
+        pdf = PDF.objects.create(name='p', distribution='normal', mean=10, sigma=1)
+        generator = PUFGenerator.objects.create(name='g', architecture='arbiter',
+            stages=16, production_pdf=pdf, sample_pdf=pdf)
+        self.analyzer = models.ChallengePairAnalyzer.objects.create(name='cp',
+            puf_generator=generator, number_of_pufs=10, workers=1)
+
+    def test_interrupted(self):
+        self.analyzer.enqueue()
+        job = models.Job.claim('test')
+        with mock.patch.object(models.ChallengePairAnalyzer, 'run', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                job.execute()
+        job.refresh_from_db()
+        self.assertEqual(job.state, 'failed')
+        self.assertEqual(self.analyzer.get_status(), 'failed')
+        self.assertIsNotNone(self.analyzer.enqueue())
+
+    @override_settings(PUFSIM_HEARTBEAT_TIMEOUT=60)
+    def test_reap_unstarted(self):
+        self.analyzer.enqueue()
+        job = models.Job.claim('test')
+        models.ChallengePairAnalyzer.reap_stale()
+        job.refresh_from_db()
+        self.assertEqual(job.state, 'running')
+        models.Job.objects.filter(pk=job.pk).update(started=job.started - timedelta(seconds=61))
+        models.ChallengePairAnalyzer.reap_stale()
+        job.refresh_from_db()
+        self.assertEqual(job.state, 'failed')
+        self.assertIsNotNone(self.analyzer.enqueue())
+
+    @override_settings(PUFSIM_MAX_RUNNING_JOBS=1)
+    def test_max_running(self):
+        self.analyzer.enqueue()
+        self.analyzer.copy().enqueue()
+        self.assertIsNotNone(models.Job.claim('a'))
+        # another worker that counted the running jobs before the claim
+        with mock.patch.object(models, 'Counter', lambda *args: Counter()):
+            self.assertIsNone(models.Job.claim('b'))
+        self.assertEqual(models.Job.objects.filter(state='running').count(), 1)
+
+    def test_changelist_queries(self):
+        self.client.force_login(User.objects.create_superuser('admin', '', 'pw'))
+        for i in range(8):
+            self.analyzer.copy().enqueue(owner=User.objects.get())
+        with self.assertNumQueries(4):
+            self.assertEqual(self.client.get('/admin/pufsim_analysis/job/').status_code, 200)
+
+
+@override_settings(PUFSIM_CHECKPOINT_INTERVAL=1e-9)
+class PopulationTest(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(PUFSIM_POPULATION_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        pdf = PDF.objects.create(name='p', distribution='normal', mean=10, sigma=1)
+        generator = PUFGenerator.objects.create(name='g', architecture='arbiter',
+            stages=16, production_pdf=pdf, sample_pdf=pdf)
+        self.population = PUFPopulation.objects.create(name='pop', size=100, seed=1,
+            puf_type=ContentType.objects.get_for_model(generator), puf_id=generator.pk)
+        self.population.build()
+        self.analyzer = models.ChallengePairAnalyzer.objects.create(name='cp',
+            puf_generator=generator, base_challenge=1, test_challenge=2,
+            number_of_pufs=100, seed=1, workers=1, population=self.population)
+
+    def test_rebuild_during_run(self):
+        expected = self.analyzer.copy().run().meta['count']
+        with mock.patch.object(models.ChallengePairAnalyzer, 'merge', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.analyzer.run()
+        self.population.seed = 2
+        self.population.build()
+        # the checkpoint still refers to the first version
+        self.assertTrue(os.path.exists(self.population.get_path(1)))
+        self.assertEqual(self.population.get_used_versions(), {1, 2})
+        analyzer = models.ChallengePairAnalyzer.objects.get(pk=self.analyzer.pk)
+        with analyzer.running():
+            result = analyzer.run(resume=True)
+        self.assertEqual(result.meta['count'], expected)
+        self.assertEqual(result.meta['population']['version'], 1)
+        self.assertFalse(os.path.exists(self.population.get_path(1)))
+        self.assertTrue(os.path.exists(self.population.get_path(2)))
+
+    def test_open_evicts_old_versions(self):
+        self.population.compile().open()
+        self.population.build()
+        self.population.compile().open()
+        paths = [path for path, gates in specs.POPULATION_FILES.values()]
+        self.assertIn(self.population.get_path(2), paths)
+        self.assertNotIn(self.population.get_path(1), paths)
+
+    def test_delete(self):
+        self.population.build()
+        path = self.population.get_path()
+        PUFPopulation.objects.filter(pk=self.population.pk).delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(os.listdir(os.path.dirname(path)), [])
+
+
+class APITest(TestCase):
+
+    def setUp(self):
+        pdf = PDF.objects.create(name='p', distribution='normal', mean=10, sigma=1)
+        generator = PUFGenerator.objects.create(name='g', architecture='arbiter',
+            stages=16, production_pdf=pdf, sample_pdf=pdf)
+        self.analyzer = models.BiasTester.objects.create(name='bias',
+            puf_type=ContentType.objects.get_for_model(generator), puf_id=generator.pk,
+            number_of_pufs=10, n=10, workers=1)
+        self.analyzer.run()
+        self.url = '/api/analysis/biastester/{}/'.format(self.analyzer.pk)
+        self.staff = User.objects.create_user('staff', is_staff=True)
+
+    def test_staff_only(self):
+        response = self.client.get(self.url + '?fields=arrays.keys')
+        self.assertEqual(response.status_code, 302)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.staff.user_permissions.add(Permission.objects.get(codename='view_biastester'))
+        response = self.client.get(self.url + '?fields=arrays.keys')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('keys', response.json()['arrays'])
+
+    def test_etag_changes_with_name(self):
+        self.client.force_login(User.objects.create_superuser('admin', '', 'pw'))
+        etag = self.client.get(self.url + '?fields=name')['ETag']
+        self.assertEqual(self.client.get(self.url + '?fields=name', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        models.BiasTester.objects.filter(pk=self.analyzer.pk).update(name='renamed')
+        response = self.client.get(self.url + '?fields=name', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'renamed')
+
+
+class SweepTest(TestCase):
+
+    def setUp(self):
+        pdf = PDF.objects.create(name='p', distribution='normal', mean=10, sigma=1)
+        generator = PUFGenerator.objects.create(name='g', architecture='arbiter',
+            stages=16, production_pdf=pdf, sample_pdf=pdf)
+        analyzer = models.ChallengePairAnalyzer.objects.create(name='cp',
+            puf_generator=generator, number_of_pufs=10, workers=1)
+        self.sweep = models.Sweep.objects.create(name='sweep',
+            analyzer_type=ContentType.objects.get_for_model(analyzer), analyzer_id=analyzer.pk,
+            grid='{"stages": [8, 16], "production_pdf.sigma": [1, 2]}')
+
+    def test_run_twice(self):
+        self.assertEqual(self.sweep.enqueue(), 4)
+        self.assertEqual(self.sweep.get_status(), 'running')
+        self.assertNotIn('Run', self.sweep.get_operations())
+        for job in models.Job.objects.all():
+            job.execute()
+        self.assertEqual(self.sweep.get_status(), 'done')
+        self.assertIn('Run', self.sweep.get_operations())
+        self.assertEqual(self.sweep.enqueue(), 4)
+        self.assertEqual(models.ChallengePairAnalyzer.objects.count(), 5)
+        self.assertEqual(models.Job.objects.filter(state='queued').count(), 4)
+
+    def test_status_queries(self):
+        self.sweep.enqueue()
+        with self.assertNumQueries(2):
+            self.sweep.get_status()
+
+
+class QuicktestTest(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        caches = override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': directory.name},
+            'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        })
+        caches.enable()
+        self.addCleanup(caches.disable)
+        pdf = PDF.objects.create(name='p', distribution='normal', mean=10, sigma=1)
+        generator = PUFGenerator.objects.create(name='g', architecture='arbiter',
+            stages=16, production_pdf=pdf, sample_pdf=pdf)
+        # as loaded by the view and the worker
+        self.generator = PUFGenerator.objects.get(pk=generator.pk)
+
+    def test_queued(self):
+        self.assertIsNone(quicktest.get_quicktest(self.generator))
+        self.assertIsNone(quicktest.get_quicktest(self.generator))
+        job = models.Job.claim('test')
+        self.assertEqual(job.kind, 'quicktest')
+        self.assertIsNone(models.Job.claim('test'))
+        job.execute()
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(quicktest.get_quicktest(self.generator)['challenges'], 1000)
+
+    @override_settings(PUFSIM_QUICKTEST_CACHE='local')
+    def test_process_local_cache(self):
+        self.assertEqual(quicktest.get_quicktest(self.generator)['challenges'], 1000)
+        self.assertFalse(models.Job.objects.exists())
+        self.assertEqual([w.id for w in checks.check_caches(None)], ['pufsim.W002'])
@@ -1,29 +1,7 @@
-from base64 import b64encode
 from django.urls import reverse
 from django.views import generic, View
-from io import BytesIO
-from matplotlib import pyplot as plt
-import numpy as np
-import puflib as pl
 from . import models
-
-
-def bar_graph(data, top=1, title='', xlabel='', ylabel=''):
-    b = BytesIO()
-    fig, ax = plt.subplots()
-    values = list(filter(lambda x: isinstance(x, (int, float)), data.values()))
-    indices = list(range(len(values)))
-    bar_width = 0.4
-    bar = ax.bar(indices, values, bar_width, color='black')
-    ax.set_xlabel(xlabel)
-    ax.set_ylabel(ylabel)
-    ax.set_title(title)
-    ax.set_xticks(indices)
-    ax.set_xticklabels([str(x) for x in data.keys()])
-    fig.tight_layout()
-    plt.ylim(0, top)
-    plt.savefig(b, format='png')
-    return 'data:image/png;base64, ' + b64encode(b.getvalue()).decode()
+from .graphs import bar_graph
 
 
 class AnalysisMixin:
@@ -43,9 +21,9 @@ class ChallengePairAnalyzerShowData(AnalysisMixin, generic.RedirectView):
     def get_redirect_url(self, *args, **kwargs):
         obj = self.model.objects.get(pk=self.kwargs.get('pk'))
         try:
-            data = int(obj.data)
+            data = obj.get_result().meta['count']
             percent = 100 * (data / obj.number_of_pufs)
-        except ValueError:
+        except AttributeError:
             messages.add_message(self.request, messages.WARNING, "ChallengePairAnalyzer not done running")
             return '/analysis/'
         if obj.pid:
@@ -64,9 +42,9 @@ class ChallengePairAnalyzerRun(AnalysisMixin, generic.RedirectView):
         if obj.pid:
             messages.add_message(self.request, messages.WARNING, "ChallengePairAnalyzer already running")
             return '/analysis/'
-        # if needed, spawn the running process & redirect
-        obj.spawn()
-        messages.add_message(self.request, messages.INFO, "ChallengePairAnalyzer spawned; refresh to update progress")
+        # if needed, queue the run & redirect
+        obj.enqueue()
+        messages.add_message(self.request, messages.INFO, "ChallengePairAnalyzer queued; refresh to update progress")
         return '/analysis/'
 
 
@@ -79,14 +57,14 @@ class NeighborPredictorShowData(AnalysisMixin, generic.TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         obj = self.model.objects.get(pk=self.kwargs.get('pk'))
-        data = eval(obj.data.encode())
+        data = obj.get_result().as_dict()
         if obj.pid:
             context['header'] = 'Neighbor Predictor'
             context['text'] = "Data not ready"
         else:
             context['header'] = 'Neighbor Predictor'
             context['title'] = str(obj)
-            context['src'] = bar_graph(data, top=100)
+            context['src'] = bar_graph(data, top=100, digest=obj.result_digest)
             context['data'] = data
         return context
 
@@ -100,9 +78,9 @@ class NeighborPredictorRun(AnalysisMixin, generic.RedirectView):
         if obj.pid:
             messages.add_message(self.request, messages.WARNING, "NeighborPredictorAnalyzer already running")
             return '/analysis/'
-        # if needed, spawn the running process & redirect
-        obj.spawn()
-        messages.add_message(self.request, messages.INFO, "NeighborPredictor spawned; refresh to update progress")
+        # if needed, queue the run & redirect
+        obj.enqueue()
+        messages.add_message(self.request, messages.INFO, "NeighborPredictor queued; refresh to update progress")
         return '/analysis/'
 
 
@@ -115,14 +93,14 @@ class BiasTesterShowData(AnalysisMixin, generic.TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         obj = self.model.objects.get(pk=self.kwargs.get('pk'))
-        data = eval(obj.data.encode())
+        data = obj.get_result().as_dict()
         if obj.pid:
             context['header'] = 'Bias Tester'
             context['text'] = "Data not ready"
         else:
             context['header'] = 'Bias Tester'
             context['title'] = str(obj)
-            context['src'] = bar_graph(data, top=100)
+            context['src'] = bar_graph(data, top=100, digest=obj.result_digest)
             context['data'] = data
         return context
 
@@ -136,7 +114,7 @@ class BiasTesterRun(AnalysisMixin, generic.RedirectView):
         if obj.pid:
             messages.add_message(self.request, messages.WARNING, "BiasTester already running")
             return '/analysis/'
-        # if needed, spawn the running process & redirect
-        obj.spawn()
-        messages.add_message(self.request, messages.INFO, "BiasTester spawned; refresh to update progress")
+        # if needed, queue the run & redirect
+        obj.enqueue()
+        messages.add_message(self.request, messages.INFO, "BiasTester queued; refresh to update progress")
         return '/analysis/'
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.core.checks import register
 
 
 class CustomConfig(AppConfig):
@@ -6,4 +7,5 @@ class CustomConfig(AppConfig):
     verbose_name = "PUFSim"
 
     def ready(self):
-        pass # startup code
+        from . import checks
+        register(checks.check_caches)
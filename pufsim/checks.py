@@ -0,0 +1,56 @@
+"""
+System checks of the app's settings, run by ``manage.py`` at startup.
+"""
+from django.conf import settings
+from django.core.checks import Warning
+
+from .settings import get_setting
+
+# cache backends whose entries other processes can't see
+PROCESS_LOCAL_CACHES = [
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+]
+
+
+def is_shared_cache(alias):
+    backend = getattr(settings, 'CACHES', {}).get(alias, {}).get('BACKEND')
+    return backend is not None and backend not in PROCESS_LOCAL_CACHES
+
+
+def check_caches(app_configs, **kwargs):
+    """
+    The Quicktest and cached progress are written by one process and read by
+    another, so they fall back to slower paths unless their caches are shared
+    between processes. The graph cache should be, so graphs are rendered once
+    rather than per process.
+    """
+    warnings = []
+    alias = get_setting('PUFSIM_QUICKTEST_CACHE')
+    if not is_shared_cache(alias):
+        warnings.append(Warning(
+            "PUFSIM_QUICKTEST_CACHE = '{}' is not a cache shared between processes".format(alias),
+            hint='Quicktests will run in the server process rather than on the '
+                'pufsim_worker processes; point it at a CACHES entry with e.g. '
+                'the file-based, Memcached or database backend.',
+            id='pufsim.W002',
+        ))
+    alias = get_setting('PUFSIM_PROGRESS_CACHE')
+    if get_setting('PUFSIM_PROGRESS_BACKEND') == 'cache' and not is_shared_cache(alias):
+        warnings.append(Warning(
+            "PUFSIM_PROGRESS_CACHE = '{}' is not a cache shared between processes".format(alias),
+            hint="Progress will be written to the database as with the 'db' "
+                'backend; point it at a CACHES entry with e.g. the file-based, '
+                'Memcached or database backend.',
+            id='pufsim.W003',
+        ))
+    # graphs are only re-rendered, but that can take minutes per process
+    alias = get_setting('PUFSIM_GRAPH_CACHE')
+    if not is_shared_cache(alias):
+        warnings.append(Warning(
+            "PUFSIM_GRAPH_CACHE = '{}' is not a cache shared between processes".format(alias),
+            hint='Every server process will render each graph again; point it '
+                'at a CACHES entry with e.g. the file-based backend.',
+            id='pufsim.W001',
+        ))
+    return warnings
@@ -0,0 +1,583 @@
+"""
+Vectorized evaluation of PUF populations.
+
+Rather than building one ``puflib`` object per PUF and running it one
+challenge at a time, a population of ``P`` arbiter PUFs is stored as a single
+``(P, stages+1)`` matrix of delay weights using the additive delay model. A
+batch of ``C`` challenges is turned into a ``(C, stages+1)`` parity feature
+matrix, and the delay differences for the whole population are one matrix
+product. XOR arbiter PUFs are stored as a ``(P, levels, stages+1)`` tensor,
+so all of their children are evaluated by the same product and the responses
+are XORed across the levels.
+
+Loop PUFs have no linear model, so a ``LoopPopulation`` keeps the gate delays
+themselves and adds up both loop paths stage by stage for the whole
+population and challenge batch at once.
+
+Challenges are handled as ``(C, stages)`` uint8 bit matrices where column
+``i`` is the bit read by stage ``i``. ``puflib`` reads bitstrings right to
+left, so column ``i`` is bit ``i`` of the integer value of the challenge.
+For storage and distances they are packed into ``uint64`` words by
+``Challenges``, which populations accept in place of a bit matrix.
+"""
+import numpy as np
+
+
+def difference_noise(pdf, shape, terms, rng):
+    """
+    Draw the noise on a delay difference that is built from ``terms`` pairs
+    of sampled gates, i.e. the sum of ``terms`` differences of two independent
+    draws from ``pdf``. Returns ``None`` if the noise is always zero.
+    """
+    if pdf.distribution == 'dirac':
+        return None
+    if pdf.distribution == 'normal':
+        return rng.normal(0.0, pdf.sigma * np.sqrt(2 * terms), shape)
+    noise = np.zeros(shape)
+    for i in range(terms):
+        noise += pdf.sample(shape, rng) - pdf.sample(shape, rng)
+    return noise
+
+
+def int_to_bits(values, stages):
+    """
+    Convert integer challenges to a ``(C, stages)`` bit matrix, truncating or
+    zero-padding the most significant side like ``get_bitstring`` does.
+    """
+    return Challenges.from_ints(np.ravel(values), stages).bits()
+
+
+def strings_to_bits(challenges):
+    """
+    Convert a list of bitstrings to a ``(C, stages)`` bit matrix.
+    """
+    b = np.array([list(c) for c in challenges], dtype='U1') == '1'
+    return b[:, ::-1].astype(np.uint8)
+
+
+def bits_to_strings(bits):
+    """
+    Convert a bit matrix (of any leading shape) to bitstrings.
+    """
+    bits = np.asarray(bits)
+    flat = bits.reshape(-1, bits.shape[-1])[:, ::-1]
+    strings = [''.join(map(str, row)) for row in flat.tolist()]
+    return np.array(strings, dtype=object).reshape(bits.shape[:-1]).tolist()
+
+
+def random_challenges(n, stages, size=None, unique=True, rng=None):
+    """
+    Generate ``n`` random challenges as a ``(n, stages)`` bit matrix, or a
+    ``(size, n, stages)`` matrix with an independent set per row when
+    ``size`` is given. See ``Challenges.random``.
+    """
+    return Challenges.random(n, stages, size, unique, rng).bits()
+
+
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """
+    Return the number of set bits in each element of a ``uint64`` array.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    b = np.ascontiguousarray(words, dtype='<u8').view(np.uint8)
+    return POPCOUNT[b].reshape(np.shape(words) + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+class Challenges:
+    """
+    A batch of challenges packed into ``uint64`` words: bit ``i`` of a
+    challenge (the bit read by stage ``i``) is bit ``i % 64`` of word
+    ``i // 64``. ``words`` has shape ``(..., ceil(stages / 64))`` and indexing
+    applies to the leading dimensions.
+    """
+
+    def __init__(self, words, stages):
+        self.words = words
+        self.stages = stages
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        return type(self)(self.words[key + (slice(None),)], self.stages)
+
+    def __eq__(self, other):
+        return (self.words == other.words).all(axis=-1)
+
+    @property
+    def shape(self):
+        return self.words.shape[:-1]
+
+    @property
+    def nbytes(self):
+        return self.words.nbytes
+
+    @staticmethod
+    def word_count(stages):
+        return max(1, -(-stages // 64))
+
+    def masked(self):
+        """
+        Clear the bits above ``stages`` in place and return ``self``.
+        """
+        if self.stages % 64:
+            self.words[..., -1] &= np.uint64((1 << (self.stages % 64)) - 1)
+        return self
+
+    @classmethod
+    def from_ints(cls, values, stages):
+        """
+        Pack integer challenges, truncating or zero-padding the most
+        significant side like ``get_bitstring`` does.
+        """
+        values = np.asarray(values, dtype=object)
+        words = np.empty(values.shape + (cls.word_count(stages),), dtype=np.uint64)
+        for w in range(words.shape[-1]):
+            words[..., w] = np.asarray((values >> (64 * w)) & (2**64 - 1)).astype(np.uint64)
+        return cls(words, stages).masked()
+
+    @classmethod
+    def from_bits(cls, bits):
+        """
+        Pack a ``(..., stages)`` bit matrix.
+        """
+        bits = np.asarray(bits, dtype=np.uint8)
+        stages = bits.shape[-1]
+        pad = 64 * cls.word_count(stages) - stages
+        bits = np.concatenate([bits, np.zeros(bits.shape[:-1] + (pad,), np.uint8)], axis=-1)
+        packed = np.packbits(bits, axis=-1, bitorder='little')
+        return cls(np.ascontiguousarray(packed).view('<u8').astype(np.uint64), stages)
+
+    @classmethod
+    def random(cls, n, stages, size=None, unique=True, rng=None):
+        """
+        Generate ``n`` random challenges, or ``(size, n)`` with an independent
+        set per row when ``size`` is given. Like
+        ``puflib.generate_random_challenges``, challenges within a set are
+        unique until all ``2**stages`` have been used.
+        """
+        if rng is None: rng = np.random.default_rng()
+        rows = 1 if size is None else size
+        if not unique or stages > 62:
+            words = rng.integers(0, 2**64 - 1, (rows, n, cls.word_count(stages)),
+                dtype=np.uint64, endpoint=True)
+        else:
+            space = 2**stages
+            if n > space // 2:
+                values = np.empty((rows, n), dtype=np.int64)
+                for r in range(rows):
+                    values[r] = np.concatenate([
+                        rng.permutation(space),
+                        rng.integers(0, space, max(0, n - space)),
+                    ])[:n]
+            else:
+                values = rng.integers(0, space, (rows, n), dtype=np.int64)
+                while True:
+                    # redraw every repeat of a value already in its set
+                    order = np.argsort(values, axis=1, kind='stable')
+                    s = np.take_along_axis(values, order, axis=1)
+                    dup = np.zeros(values.shape, dtype=bool)
+                    np.put_along_axis(dup, order[:, 1:], s[:, 1:] == s[:, :-1], axis=1)
+                    count = np.count_nonzero(dup)
+                    if not count: break
+                    values[dup] = rng.integers(0, space, count, dtype=np.int64)
+            words = values.astype(np.uint64)[..., None]
+        c = cls(words, stages).masked()
+        return c[0] if size is None else c
+
+    def bits(self):
+        """
+        Return the challenges as a ``(..., stages)`` uint8 bit matrix.
+        """
+        b = np.ascontiguousarray(self.words, dtype='<u8').view(np.uint8)
+        return np.unpackbits(b, axis=-1, bitorder='little')[..., :self.stages]
+
+    def flip(self, i):
+        """
+        Return the challenges with the bit read by stage ``i`` flipped.
+        """
+        words = self.words.copy()
+        words[..., i // 64] ^= np.uint64(1 << (i % 64))
+        return type(self)(words, self.stages)
+
+    def flips(self):
+        """
+        Return every single-bit flip of the challenges, with shape
+        ``(..., stages)`` where ``[..., i]`` has bit ``i`` flipped.
+        """
+        eye = Challenges.from_bits(np.eye(self.stages, dtype=np.uint8)).words
+        return type(self)(self.words[..., None, :] ^ eye, self.stages)
+
+    def hamming(self, other):
+        """
+        Return the Hamming distance to ``other``, broadcasting like NumPy.
+        """
+        return popcount(self.words ^ other.words).sum(axis=-1, dtype=np.int64)
+
+
+def as_bits(challenges):
+    """
+    Return ``challenges`` as a bit matrix, unpacking ``Challenges``.
+    """
+    if isinstance(challenges, Challenges): return challenges.bits()
+    return challenges
+
+
+def parity_features(bits):
+    """
+    Return the parity feature transform of a bit matrix: a leading column of
+    ones followed by the running product of ``1 - 2*bit`` along the stages.
+    """
+    x = 1.0 - 2.0 * np.asarray(bits, dtype=float)
+    phi = np.cumprod(x, axis=-1)
+    ones = np.ones(phi.shape[:-1] + (1,))
+    return np.concatenate([ones, phi], axis=-1)
+
+
+def challenge_distances(queries, known, metric='gamma'):
+    """
+    Return the ``puflib.gamma`` or ``puflib.hamming`` distance between every
+    query and every known challenge, as a ``(..., Q, K)`` integer matrix for
+    ``(..., Q, stages)`` queries and ``(..., K, stages)`` known challenges.
+
+    The Hamming distance of packed ``Challenges`` is a popcount. Otherwise
+    both are linear in the ``+1/-1`` encodings, so they are computed as one
+    matrix product. For gamma, the prefix parity of ``q ^ c`` is the product
+    of the parity features of ``q`` and ``c``, and
+    ``gamma = (1 + 2*sum(s[:-1]) + s[-1]) / 2`` over that ``+1/-1`` parity
+    ``s``.
+    """
+    if metric != 'gamma' and isinstance(queries, Challenges) and isinstance(known, Challenges):
+        return queries[..., :, None].hamming(known[..., None, :])
+    queries, known = as_bits(queries), as_bits(known)
+    stages = np.shape(queries)[-1]
+    if metric == 'gamma':
+        q = parity_features(queries)
+        c = parity_features(known)
+        w = np.full(stages + 1, 2.0)
+        w[0] = w[-1] = 1.0
+        # the leading ones of the features give the constant 1
+        d = np.matmul(q * w, np.swapaxes(c, -1, -2)) / 2
+    else:
+        q = 1.0 - 2.0 * np.asarray(queries, dtype=float)
+        c = 1.0 - 2.0 * np.asarray(known, dtype=float)
+        d = (stages - np.matmul(q, np.swapaxes(c, -1, -2))) / 2
+    return np.rint(d).astype(np.int64)
+
+
+def hamming_histogram(words, length, block=256):
+    """
+    Return the histogram of the Hamming distances between every pair of rows
+    of the ``(N, W)`` packed ``words``, as an array of ``length + 1`` counts.
+    The pairs are visited in ``block`` by ``block`` tiles, so memory stays
+    bounded however many rows there are.
+    """
+    counts = np.zeros(length + 1, dtype=np.int64)
+    n = len(words)
+    dtype = np.uint8 if length < 256 else np.uint32
+    for i in range(0, n, block):
+        a = words[i:i+block, None]
+        for j in range(i, n, block):
+            b = words[None, j:j+block]
+            d = popcount(a[..., 0] ^ b[..., 0]).astype(dtype)
+            for w in range(1, words.shape[1]):
+                d += popcount(a[..., w] ^ b[..., w])
+            if i == j:
+                d = d[np.triu_indices(len(d), 1)]
+            counts += np.bincount(d.ravel(), minlength=length + 1)
+    return counts
+
+
+def arbitrate(d, sensitivity, rng):
+    """
+    Turn delay differences into responses. ``puflib`` randomly adds the
+    sensitivity to one of the two paths, so wherever that choice can change
+    the outcome, the response is a coin flip.
+    """
+    r = d - sensitivity > 0
+    if sensitivity:
+        mask = (d + sensitivity > 0) & ~r
+        r[mask] = rng.random(np.count_nonzero(mask)) < 0.5
+    return r.astype(np.uint8)
+
+
+class Population:
+    """
+    Abstract population of PUFs. Subclasses implement ``__len__`` and
+    ``evaluate(challenges)``, where ``challenges`` is either a shared
+    ``(C, stages)`` bit matrix or a ``(P, C, stages)`` matrix with one set of
+    challenges per PUF (or the equivalent ``Challenges``), and the result is a
+    ``(P, C)`` uint8 response matrix.
+    Any randomness during evaluation is drawn from the population's ``rng``.
+    """
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def evaluate(self, challenges):
+        raise NotImplementedError
+
+    def split(self, parts):
+        """
+        Deal the PUFs out round-robin into ``parts`` populations.
+        """
+        raise NotImplementedError
+
+    def evaluate_flips(self, challenge):
+        """
+        Evaluate one challenge and every single-bit flip of it, returning the
+        ``(P,)`` base responses and the ``(P, stages)`` flipped responses,
+        where column ``i`` has bit ``i`` flipped.
+        """
+        bits = as_bits(challenge).reshape(-1)
+        flipped = bits ^ np.eye(len(bits), dtype=np.uint8)
+        r = self.evaluate(np.concatenate([bits[None], flipped]))
+        return r[:, 0], r[:, 1:]
+
+    def evaluate_repeated(self, challenges, repeats):
+        """
+        Evaluate shared ``(C, stages)`` challenges ``repeats`` times with
+        fresh noise each time, returning a ``(P, repeats, C)`` response
+        array.
+        """
+        bits = as_bits(challenges)
+        r = self.evaluate(np.tile(bits, (repeats, 1)))
+        return r.reshape(len(self), repeats, len(bits))
+
+
+class ArbiterPopulation(Population):
+    """
+    Population of arbiter PUFs stored as a ``(P, stages+1)`` weight matrix.
+    """
+
+    def __init__(self, weights, sensitivity=0.0, sample_pdf=None, rng=None):
+        self.weights = weights
+        self.sensitivity = sensitivity
+        self.sample_pdf = sample_pdf
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def __len__(self):
+        return self.weights.shape[0]
+
+    @property
+    def stages(self):
+        return self.weights.shape[-1] - 1
+
+    @classmethod
+    def from_gates(cls, gates, *args, **kwargs):
+        """
+        Build the population from a ``(P, stages, 4)`` array of gate delays,
+        ordered ``up.up``, ``up.down``, ``down.up``, ``down.down`` like
+        ``puflib`` builds them. A stage adds ``up.up - down.up`` to the delay
+        difference when its bit is 0 and ``down.down - up.down`` when it is
+        1, signed by the parity of the bits read so far.
+        """
+        w0 = gates[..., 0] - gates[..., 2]
+        w1 = gates[..., 3] - gates[..., 1]
+        alpha = (w0 + w1) / 2
+        beta = (w0 - w1) / 2
+        weights = np.zeros(gates.shape[:-2] + (gates.shape[-2] + 1,))
+        weights[..., 0] = beta[..., 0]
+        weights[..., 1:-1] = alpha[..., :-1] + beta[..., 1:]
+        weights[..., -1] = alpha[..., -1]
+        return cls(weights, *args, **kwargs)
+
+    def delay_differences(self, challenges, noise=True):
+        phi = parity_features(as_bits(challenges))
+        if phi.ndim == 2:
+            w = self.weights.reshape(-1, phi.shape[-1])
+            d = (w @ phi.T).reshape(self.weights.shape[:-1] + (len(phi),))
+        else:
+            d = np.einsum('p...f,pcf->p...c', self.weights, phi)
+        return self.add_noise(d) if noise else d
+
+    def add_noise(self, d):
+        """
+        Add the sample noise to the delay differences ``d`` in place.
+        """
+        if self.sample_pdf is not None:
+            noise = difference_noise(self.sample_pdf, d.shape, self.stages, self.rng)
+            if noise is not None: d += noise
+        return d
+
+    def respond(self, d):
+        """
+        Turn the ``(P, C)`` delay differences into responses.
+        """
+        return arbitrate(d, self.sensitivity, self.rng)
+
+    def evaluate(self, challenges):
+        return self.respond(self.delay_differences(challenges))
+
+    def evaluate_flips(self, challenge):
+        """
+        Flipping bit ``i`` negates the parity features after it, so each
+        flipped delay difference is the base one minus twice a suffix sum of
+        the weighted base features, all in one pass over the population.
+        """
+        phi = parity_features(as_bits(challenge).reshape(-1))
+        t = self.weights * phi
+        suffix = np.cumsum(t[..., ::-1], axis=-1)[..., ::-1]
+        d = np.empty_like(t)
+        d[..., 0] = suffix[..., 0]
+        d[..., 1:] = suffix[..., :1] - 2 * suffix[..., 1:]
+        r = self.respond(self.add_noise(d))
+        return r[:, 0], r[:, 1:]
+
+    def evaluate_repeated(self, challenges, repeats):
+        """
+        The noiseless delay differences are computed once and only the noise
+        is drawn for every repetition.
+        """
+        d = self.delay_differences(challenges, noise=False)
+        d = np.repeat(d[..., None, :], repeats, axis=-2)
+        return self.respond(self.add_noise(d))
+
+    def split(self, parts):
+        return [
+            type(self)(self.weights[i::parts], self.sensitivity, self.sample_pdf, self.rng)
+            for i in range(parts)
+        ]
+
+
+class XorArbiterPopulation(ArbiterPopulation):
+    """
+    Population of XOR arbiter PUFs stored as a ``(P, levels, stages+1)``
+    weight tensor, one row of weights per child.
+    """
+
+    @property
+    def levels(self):
+        return self.weights.shape[1]
+
+    def respond(self, d):
+        """
+        Arbitrate the ``(P, levels, C)`` delay differences of every child,
+        with its own sensitivity coin flips, and XOR the responses across the
+        levels, i.e. take the product of the signs.
+        """
+        return np.bitwise_xor.reduce(arbitrate(d, self.sensitivity, self.rng), axis=1)
+
+
+class LoopPopulation(Population):
+    """
+    Population of loop PUFs stored as a ``(P, stages, 4)`` array of gate
+    delays, ordered like ``ArbiterPopulation.from_gates`` expects.
+    """
+
+    def __init__(self, gates, sensitivity=0.0, sample_pdf=None, rng=None):
+        self.gates = gates
+        self.sensitivity = sensitivity
+        self.sample_pdf = sample_pdf
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def __len__(self):
+        return self.gates.shape[0]
+
+    @property
+    def stages(self):
+        return self.gates.shape[1]
+
+    def path_delays(self, challenges):
+        """
+        Return the ``(P, C)`` delays of the challenge path and of its
+        complement. Every gate is sampled with its own noise, and the delays
+        are summed stage by stage in the same order as ``puflib``, so they
+        are bit-for-bit the same for the same samples.
+        """
+        bits = as_bits(challenges)
+        shape = (len(self), bits.shape[-2], 4)
+        d1 = np.zeros(shape[:-1])
+        d2 = np.zeros(shape[:-1])
+        pdf = self.sample_pdf
+        for i in range(self.stages):
+            s = np.broadcast_to(self.gates[:, None, i], shape)
+            if pdf is None:
+                pass
+            elif pdf.distribution == 'dirac':
+                s = s + pdf.mean
+            else:
+                s = s + pdf.sample(shape, self.rng)
+            # up.up + down.down and up.down + down.up
+            a = s[..., 0] + s[..., 3]
+            b = s[..., 1] + s[..., 2]
+            bit = bits[..., i].astype(bool)
+            d1 += np.where(bit, b, a)
+            d2 += np.where(bit, a, b)
+        return d1, d2
+
+    def evaluate(self, challenges):
+        """
+        Like ``puflib``, the sensitivity is added to one of the two paths at
+        random before they are compared.
+        """
+        d1, d2 = self.path_delays(challenges)
+        if not self.sensitivity:
+            return (d1 - d2 > 0).astype(np.uint8)
+        first = self.rng.random(d1.shape) < 0.5
+        r = np.where(first, d1 + self.sensitivity - d2 > 0, d1 - (d2 + self.sensitivity) > 0)
+        return r.astype(np.uint8)
+
+    def split(self, parts):
+        return [
+            type(self)(self.gates[i::parts], self.sensitivity, self.sample_pdf, self.rng)
+            for i in range(parts)
+        ]
+
+
+class ObjectPopulation(Population):
+    """
+    Fallback population wrapping a list of ``puflib`` objects, for
+    architectures that have no vectorized model.
+    """
+
+    def __init__(self, pufs):
+        self.pufs = pufs
+
+    def __len__(self):
+        return len(self.pufs)
+
+    def evaluate(self, challenges):
+        challenges = as_bits(challenges)
+        strings = bits_to_strings(challenges)
+        if np.ndim(challenges) == 2:
+            strings = [strings] * len(self.pufs)
+        return np.array(
+            [[p.run(c) for c in s] for p, s in zip(self.pufs, strings)],
+            dtype=np.uint8,
+        ).reshape(len(self.pufs), -1)
+
+    def split(self, parts):
+        return [type(self)(self.pufs[i::parts]) for i in range(parts)]
+
+
+class XorPopulation(Population):
+    """
+    Population of XOR composite PUFs built from one population per level.
+    """
+
+    def __init__(self, children):
+        self.children = children
+
+    def __len__(self):
+        return len(self.children[0])
+
+    def evaluate(self, challenges):
+        challenges = as_bits(challenges)
+        r = self.children[0].evaluate(challenges)
+        for child in self.children[1:]:
+            r ^= child.evaluate(challenges)
+        return r
+
+    def evaluate_flips(self, challenge):
+        base, flipped = self.children[0].evaluate_flips(challenge)
+        for child in self.children[1:]:
+            b, f = child.evaluate_flips(challenge)
+            base ^= b
+            flipped ^= f
+        return base, flipped
@@ -0,0 +1,27 @@
+"""
+Deferred imports for heavy dependencies.
+
+Every ``django.setup()`` imports all models and admin modules, including in
+each headless worker, so numpy, puflib and matplotlib are only loaded once
+they are actually used.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Return module ``name``, deferring its execution until the first time one
+    of its attributes is accessed.
+    """
+    try:
+        return sys.modules[name]
+    except KeyError:
+        pass
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pufsim import models
+
+class Command(BaseCommand):
+    help = 'Builds (or rebuilds) the specified PUF population'
+
+    def add_arguments(self, parser):
+        parser.add_argument('population_id', nargs=1, type=int)
+
+    def handle(self, *args, **options):
+        try:
+            obj = models.PUFPopulation.objects.get(pk=options['population_id'][0])
+        except models.PUFPopulation.DoesNotExist:
+            raise CommandError("PUFSIM :: (build_population) population not found")
+        try:
+            obj.build()
+        except ValueError as e:
+            raise CommandError("PUFSIM :: (build_population) {}".format(e))
+        print("PUFSIM :: (build_population) built {} version {}: {}".format(obj, obj.version, obj.get_path(obj.version)))
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.28 on 2026-10-18 08:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+import gfklookupwidget.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('pufsim', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PUFPopulation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('puf_id', gfklookupwidget.fields.GfkLookupField()),
+                ('size', models.IntegerField(default=1000, help_text='Number of PUFs.')),
+                ('seed', models.PositiveIntegerField(blank=True, help_text='Seed for the production delays; leave blank to pick one at random.', null=True)),
+                ('version', models.PositiveIntegerField(default=0, editable=False, help_text='Incremented every time the population is built.')),
+                ('built', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('puf_type', models.ForeignKey(limit_choices_to=models.Q(models.Q(('app_label', 'pufsim'), ('model', 'pufgenerator')), models.Q(('app_label', 'pufsim'), ('model', 'compositepufgenerator')), _connector='OR'), on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType')),
+            ],
+            options={
+                'verbose_name': 'PUF Population',
+            },
+        ),
+    ]
@@ -1,6 +1,17 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
-import numpy as np
-import puflib as pl
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from gfklookupwidget.fields import GfkLookupField
+import os
+
+from .lazy import lazy_import
+from .settings import get_setting
+
+np = lazy_import('numpy')
+specs = lazy_import('pufsim.specs')
 
 
 class PDF(models.Model):
@@ -42,24 +53,54 @@ class PDF(models.Model):
             except ValueError: pass
         return r
 
-    def save(self, *args, **kwargs):
+    def normalize(self):
+        """
+        Default the fields the distribution uses and clear the others.
+        """
         for x in self.opt_fields:
             if getattr(self, x) is None: setattr(self, x, 0.0)
         for x in self.nopt_fields:
             setattr(self, x, None)
+
+    def save(self, *args, **kwargs):
+        self.normalize()
         return super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
+    def compile(self):
+        """
+        Return the distribution as an immutable ``specs.PDFSpec``.
+        """
+        return specs.PDFSpec(self.distribution, self.mean, self.sigma, self.lbound, self.rbound)
+
     def get_rng(self):
-        if self.distribution == 'dirac':
-            return lambda: self.mean
-        if self.distribution == 'normal':
-            return lambda: np.random.normal(self.mean, self.sigma)
-        if self.distribution == 'uniform':
-            return lambda: np.random.uniform(self.lbound, self.rbound)
-        return None
+        return self.compile().get_rng()
+
+    def derive(self, changes, name=None):
+        """
+        Return a PDF like this one with the fields in ``changes`` changed,
+        reusing an identical PDF if there is one.
+        """
+        fields = ['distribution', 'mean', 'sigma', 'lbound', 'rbound']
+        pdf = PDF(name=name or self.name, **{f: getattr(self, f) for f in fields})
+        for k, v in changes.items():
+            setattr(pdf, k, pdf._meta.get_field(k).to_python(v))
+        pdf.normalize()
+        values = {f: getattr(pdf, f) for f in fields}
+        if all(getattr(self, f) == v for f, v in values.items()): return self
+        existing = PDF.objects.filter(**values).first()
+        if existing: return existing
+        pdf.save()
+        return pdf
+
+    def sample(self, shape=None, rng=None):
+        """
+        Draw an array of the given shape from the distribution using the
+        ``np.random.Generator`` passed as ``rng`` (a fresh one by default).
+        """
+        return self.compile().sample(shape, rng)
 
 
 class PUFGenerator(models.Model):
@@ -77,6 +118,13 @@ class PUFGenerator(models.Model):
     sample_pdf = models.ForeignKey(PDF, verbose_name='Sample PDF', on_delete=models.CASCADE, related_name='sample_pdf_revacc', help_text='Variance each time the produced PUF is sampled.')
     sensitivity = models.FloatField(default=0.0, help_text='If the difference in delay of the two signal paths in the PUF is less than this value, then the result will be random. Otherwise, the result is deterministic.')
 
+    # parameters that a sweep can vary, see ``derive``
+    sweep_parameters = ['stages', 'sensitivity'] + [
+        '{}.{}'.format(pdf, f)
+        for pdf in ('production_pdf', 'sample_pdf')
+        for f in ('mean', 'sigma', 'lbound', 'rbound')
+    ]
+
     model_order = 2
 
     class Meta:
@@ -88,17 +136,47 @@ class PUFGenerator(models.Model):
     def get_actions(self):
         return ['quicktest']
 
+    def derive(self, params, name=None):
+        """
+        Return a generator like this one with the ``sweep_parameters`` in
+        ``params`` (e.g. ``{'stages': 64, 'production_pdf.sigma': 0.2}``)
+        changed, reusing an identical generator if there is one.
+        """
+        fields = {
+            'architecture': self.architecture,
+            'stages': self.stages,
+            'production_pdf': self.production_pdf,
+            'sample_pdf': self.sample_pdf,
+            'sensitivity': self.sensitivity,
+        }
+        for pdf in ('production_pdf', 'sample_pdf'):
+            changes = {k.split('.', 1)[1]: v for k, v in params.items() if k.startswith(pdf + '.')}
+            if changes: fields[pdf] = fields[pdf].derive(changes, name)
+        for k in ('stages', 'sensitivity'):
+            if k in params: fields[k] = self._meta.get_field(k).to_python(params[k])
+        if all(getattr(self, k) == v for k, v in fields.items()): return self
+        existing = PUFGenerator.objects.filter(**fields).first()
+        return existing or PUFGenerator.objects.create(name=name or self.name, **fields)
+
+    def compile(self):
+        """
+        Return the generator and its PDFs as an immutable
+        ``specs.GeneratorSpec``, which needs no database access to simulate.
+        """
+        return specs.GeneratorSpec(self.architecture, self.stages, self.sensitivity,
+            self.production_pdf.compile(), self.sample_pdf.compile())
+
     def generate_puf(self):
         """
         Generate a PUF based on the specifications.
         """
-        p = self.production_pdf.get_rng()
-        s = self.sample_pdf.get_rng()
-        if self.architecture == 'loop':
-            return pl.Loop(self.stages, self.sensitivity, p, s)
-        if self.architecture == 'arbiter':
-            return pl.Arbiter(self.stages, self.sensitivity, p, s)
-        return None
+        return self.compile().generate_puf()
+
+    def generate_population(self, n, rng=None):
+        """
+        Generate a population of ``n`` PUFs based on the specifications.
+        """
+        return self.compile().generate_population(n, rng)
 
 
 class CompositePUFGenerator(models.Model):
@@ -113,6 +191,8 @@ class CompositePUFGenerator(models.Model):
     child_architecture = models.ForeignKey(PUFGenerator, on_delete=models.PROTECT)
     levels = models.IntegerField(default=10)
 
+    sweep_parameters = ['levels'] + PUFGenerator.sweep_parameters
+
     model_order = 3
 
     @property
@@ -125,10 +205,161 @@ class CompositePUFGenerator(models.Model):
     def __str__(self):
         return self.name
 
+    def derive(self, params, name=None):
+        """
+        Return a composite generator like this one with ``levels`` and the
+        parameters of the child generator in ``params`` changed, reusing
+        identical generators if there are any.
+        """
+        child_params = {k: v for k, v in params.items() if k != 'levels'}
+        child = self.child_architecture.derive(child_params, name)
+        levels = self._meta.get_field('levels').to_python(params.get('levels', self.levels))
+        if child == self.child_architecture and levels == self.levels: return self
+        fields = {'architecture': self.architecture, 'child_architecture': child, 'levels': levels}
+        existing = CompositePUFGenerator.objects.filter(**fields).first()
+        return existing or CompositePUFGenerator.objects.create(name=name or self.name, **fields)
+
+    def compile(self):
+        """
+        Return the generator and its child as an immutable
+        ``specs.CompositeSpec``.
+        """
+        return specs.CompositeSpec(self.architecture, self.child_architecture.compile(), self.levels)
+
     def generate_puf(self):
         """
         Generate a Composite PUF based on the specifications.
         """
-        if self.architecture == 'xor':
-            return pl.Xor(pufs=[self.child_architecture.generate_puf() for x in range(self.levels)])
-        return None
+        return self.compile().generate_puf()
+
+    def generate_population(self, n, rng=None):
+        """
+        Generate a population of ``n`` Composite PUFs based on the
+        specifications.
+        """
+        return self.compile().generate_population(n, rng)
+
+
+class PUFPopulation(models.Model):
+    """
+    A stored population of PUFs: the production delays of every gate, drawn
+    once and saved as a memory-mapped ``.npy`` file so that analyzers can run
+    on the same chips
+    """
+    name = models.CharField(max_length=255)
+    puf_type_limit = models.Q(app_label='pufsim', model='pufgenerator') | models.Q(app_label='pufsim', model='compositepufgenerator')
+    puf_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, limit_choices_to=puf_type_limit)
+    puf_id = GfkLookupField('puf_type')
+    puf_generator = GenericForeignKey('puf_type', 'puf_id')
+    size = models.IntegerField(default=1000, help_text='Number of PUFs.')
+    seed = models.PositiveIntegerField(blank=True, null=True, help_text='Seed for the production delays; leave blank to pick one at random.')
+    version = models.PositiveIntegerField(default=0, editable=False, help_text='Incremented every time the population is built.')
+    built = models.DateTimeField(blank=True, null=True, editable=False)
+
+    # number of PUFs drawn at once while building
+    build_batch = 2**14
+
+    model_order = 4
+
+    class Meta:
+        verbose_name = 'PUF Population'
+
+    def __str__(self):
+        return self.name
+
+    def get_path(self, version=None):
+        name = '{}-v{}.npy'.format(self.pk, self.version if version is None else version)
+        return os.path.join(get_setting('PUFSIM_POPULATION_DIR'), name)
+
+    def get_generator(self):
+        """
+        Return the generator whose gates are stored, and how many of
+        its PUFs make up one PUF of the population.
+        """
+        generator = self.puf_generator
+        if isinstance(generator, CompositePUFGenerator):
+            return generator.child_architecture, generator.levels
+        return generator, 1
+
+    def build(self):
+        """
+        Draw the production delays of every gate and write them to a new
+        version of the file, a batch of PUFs at a time so memory stays
+        bounded. Old versions are removed once the new one is in place and
+        no analyzer uses them any more, see ``prune``.
+        """
+        generator, levels = self.get_generator()
+        if generator.architecture not in ('arbiter', 'loop'):
+            raise ValueError('only arbiter and loop populations can be stored')
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed))
+        n = self.size * levels
+        os.makedirs(get_setting('PUFSIM_POPULATION_DIR'), exist_ok=True)
+        self.version += 1
+        path = self.get_path()
+        gates = np.lib.format.open_memmap(path + '.tmp', mode='w+', dtype=np.float64,
+            shape=(n, generator.stages, 4))
+        pdf = generator.production_pdf.compile()
+        for i in range(0, n, self.build_batch):
+            size = min(self.build_batch, n - i)
+            gates[i:i+size] = pdf.sample((size, generator.stages, 4), rng)
+        gates.flush()
+        del gates
+        os.replace(path + '.tmp', path)
+        self.built = timezone.now()
+        self.save()
+        self.prune()
+
+    def get_used_versions(self):
+        """
+        Return the versions that analyzers may still read: the current one,
+        the ones their checkpoints were taken on and, while any of them is
+        running, all of them.
+        """
+        versions = {self.version}
+        for rel in self._meta.related_objects:
+            analyzers = rel.related_model.objects.filter(**{rel.field.name: self})
+            if analyzers.filter(pid__gt=0).exists():
+                return set(range(1, self.version + 1))
+            versions.update(analyzers.filter(population_version__isnull=False).values_list(
+                'population_version', flat=True).distinct())
+        return versions
+
+    def prune(self):
+        """
+        Remove the files of old versions that no analyzer uses any more.
+        """
+        self.refresh_from_db(fields=['version'])
+        used = self.get_used_versions()
+        for version in range(1, self.version):
+            path = self.get_path(version)
+            if version not in used and os.path.exists(path): os.remove(path)
+
+    def compile(self, version=None):
+        """
+        Return the built population, by default its current version, as an
+        immutable ``specs.PopulationSpec``.
+        """
+        generator, levels = self.get_generator()
+        if version is None: version = self.version
+        return specs.PopulationSpec(self.get_path(version), self.size,
+            generator.compile(), levels, version)
+
+    def open(self):
+        return self.compile().open()
+
+    def get_population(self, start, n, rng=None):
+        """
+        Return PUFs ``start`` to ``start + n`` as an ``engine.Population``.
+        """
+        return self.compile().get_population(start, n, rng)
+
+
+@receiver(post_delete, sender=PUFPopulation)
+def remove_population_files(sender, instance, **kwargs):
+    """
+    Remove the files of every version of a deleted population, also when it
+    is deleted in bulk, e.g. by the admin's delete action.
+    """
+    for version in range(1, instance.version + 1):
+        path = instance.get_path(version)
+        if os.path.exists(path): os.remove(path)
@@ -0,0 +1,124 @@
+"""
+Quick statistics of a PUF generator for the admin's Quicktest button.
+
+A Quicktest evaluates ``PUFSIM_QUICKTEST_CHALLENGES`` challenges
+``PUFSIM_QUICKTEST_SAMPLES`` times each on ``PUFSIM_QUICKTEST_PUFS`` PUFs
+through the vectorized engine, and stops after the chunk of challenges
+during which ``PUFSIM_QUICKTEST_BUDGET`` seconds have passed. It is queued
+as a job for the ``pufsim_worker`` processes, so no numerical work runs in
+the server, and the result is cached (``PUFSIM_QUICKTEST_CACHE``) under the
+generator's configuration, so the same configuration is only ever tested
+once. Unless that cache is shared between processes, the server couldn't
+see the workers' results, so the Quicktest runs in the request instead.
+"""
+from django.core.cache import caches
+
+from django.utils import timezone
+from datetime import timedelta
+import hashlib
+import time
+
+from .checks import is_shared_cache
+from .lazy import lazy_import
+from .settings import get_setting
+
+analysis = lazy_import('pufsim.analysis.models')
+engine = lazy_import('pufsim.engine')
+np = lazy_import('numpy')
+
+
+def run_quicktest(spec, pufs, challenges, samples, budget, chunk=64, seed=0):
+    """
+    Evaluate the challenges on a population of the compiled generator
+    ``spec``, ``chunk`` challenges at a time, and return a dictionary with
+    the bias and reliability in percent and the time per evaluation.
+    Reliability is the share of samples agreeing with the majority sample.
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    pop = spec.generate_population(pufs, rng)
+    c = engine.Challenges.random(challenges, spec.stages, rng=rng)
+    ones = errors = evaluations = done = 0
+    for i in range(0, challenges, chunk):
+        r = pop.evaluate_repeated(c[i:i+chunk], samples)
+        reference = 2 * r.sum(axis=1, dtype=np.int64) >= samples
+        ones += int(r.sum(dtype=np.int64))
+        errors += int(np.count_nonzero(r != reference[:, None]))
+        evaluations += r.size
+        done = min(challenges, i + chunk)
+        if time.perf_counter() - started > budget: break
+    elapsed = time.perf_counter() - started
+    return {
+        'bias': 100 * ones / evaluations,
+        'reliability': 100 - 100 * errors / evaluations,
+        'per_evaluation': elapsed / evaluations,
+        'evaluations': evaluations,
+        'challenges': done,
+    }
+
+
+def get_key(spec, *args):
+    config = hashlib.sha256(repr((spec,) + args).encode()).hexdigest()
+    return 'pufsim:quicktest:{}'.format(config)
+
+
+def get_config(generator):
+    """
+    Return the compiled ``generator``, the arguments of its Quicktest after
+    the spec and the cache key of its result.
+    """
+    spec = generator.compile()
+    args = (
+        get_setting('PUFSIM_QUICKTEST_PUFS'),
+        get_setting('PUFSIM_QUICKTEST_CHALLENGES'),
+        get_setting('PUFSIM_QUICKTEST_SAMPLES'),
+        get_setting('PUFSIM_QUICKTEST_BUDGET'),
+    )
+    return spec, args, get_key(spec, *args)
+
+
+def reap_stale():
+    """
+    Fail Quicktest jobs that have been running for longer than the budget
+    plus the heartbeat timeout, i.e. whose worker died.
+    """
+    timeout = get_setting('PUFSIM_QUICKTEST_BUDGET') + get_setting('PUFSIM_HEARTBEAT_TIMEOUT')
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    analysis.Job.objects.filter(kind='quicktest', state='running', started__lt=cutoff).update(
+        state='failed', error='worker stopped during the quicktest', finished=timezone.now())
+
+
+def execute(generator):
+    """
+    Run the Quicktest of ``generator``, unless its result is already cached,
+    and cache the result.
+    """
+    spec, args, key = get_config(generator)
+    cache = caches[get_setting('PUFSIM_QUICKTEST_CACHE')]
+    try:
+        if cache.get(key) is None:
+            cache.set(key, run_quicktest(spec, *args), get_setting('PUFSIM_QUICKTEST_CACHE_TIMEOUT'))
+    finally:
+        cache.delete(key + ':queued')
+
+
+def get_quicktest(generator, owner=None):
+    """
+    Return the cached Quicktest result of ``generator``'s configuration, or
+    ``None`` after queueing the Quicktest for the workers.
+    """
+    spec, args, key = get_config(generator)
+    alias = get_setting('PUFSIM_QUICKTEST_CACHE')
+    cache = caches[alias]
+    result = cache.get(key)
+    if result is not None: return result
+    if not is_shared_cache(alias):
+        result = run_quicktest(spec, *args)
+        cache.set(key, result, get_setting('PUFSIM_QUICKTEST_CACHE_TIMEOUT'))
+        return result
+    reap_stale()
+    # until the job is done or the marker expires, clicks don't queue another
+    if cache.add(key + ':queued', True, args[-1] + get_setting('PUFSIM_HEARTBEAT_TIMEOUT')):
+        analysis.Job.objects.create(kind='quicktest', analyzer=generator, owner=owner,
+            priority=get_setting('PUFSIM_QUICKTEST_PRIORITY'))
+    return None
@@ -105,3 +105,40 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'docroot')
 APPEND_SLASH = True
+CACHES = {
+    # shared by the server and worker processes, see ``pufsim.checks``
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(base_dir, 'cache'),
+        'OPTIONS': {'MAX_ENTRIES': 300},
+    },
+}
+
+# This section defines defaults for the settings of this app.
+# shard processes per run, split between the pufsim_worker processes
+PUFSIM_WORKERS = os.cpu_count() or 1
+# 'db' or 'cache'; the cache must be shared between processes (e.g. not locmem)
+PUFSIM_PROGRESS_BACKEND = 'db'
+PUFSIM_PROGRESS_CACHE = 'default'
+PUFSIM_PROGRESS_STEP = 1
+PUFSIM_PROGRESS_INTERVAL = 5.0
+PUFSIM_WORKER_PROCESSES = 1
+PUFSIM_WORKER_POLL_INTERVAL = 2.0
+PUFSIM_MAX_RUNNING_JOBS = 0  # 0 for no limit
+PUFSIM_HEARTBEAT_INTERVAL = 10.0  # seconds
+PUFSIM_HEARTBEAT_TIMEOUT = 60.0  # seconds
+PUFSIM_CHECKPOINT_INTERVAL = 60.0  # seconds, 0 to disable
+PUFSIM_POPULATION_DIR = os.path.join(base_dir, 'populations')
+PUFSIM_STARTUP_BUDGET = 1.5  # seconds, see the `check_startup` command
+# rendered graphs are bounded by the cache's MAX_ENTRIES; it should be shared
+# between processes, or every server process renders each graph again
+PUFSIM_GRAPH_CACHE = 'default'
+PUFSIM_GRAPH_CACHE_TIMEOUT = None  # seconds, None to keep until evicted
+# the Quicktest evaluates CHALLENGES challenges SAMPLES times on PUFS PUFs
+PUFSIM_QUICKTEST_PUFS = 10
+PUFSIM_QUICKTEST_CHALLENGES = 1000
+PUFSIM_QUICKTEST_SAMPLES = 10
+PUFSIM_QUICKTEST_BUDGET = 2.0  # seconds
+PUFSIM_QUICKTEST_CACHE = 'default'  # shared between processes, or Quicktests run in the server
+PUFSIM_QUICKTEST_CACHE_TIMEOUT = None  # seconds, None to keep until evicted
+PUFSIM_QUICKTEST_PRIORITY = 100  # of the queued jobs, so they run before analyzers
@@ -0,0 +1,192 @@
+"""
+Compiled specifications of PUF generators.
+
+``compile()`` on a ``PDF``, ``PUFGenerator``, ``CompositePUFGenerator`` or
+``PUFPopulation`` reads the model and everything it refers to once and
+returns an immutable, picklable spec made of plain Python values. Analyzer
+runs compile their generator before simulating, so the simulation loops never
+query the database (or the ``ContentType`` of a generic foreign key) and the
+spec can be shipped to worker processes as is.
+
+Like ``pufsim.engine``, this module must stay importable without Django.
+"""
+from typing import NamedTuple
+import numpy as np
+
+from . import engine
+
+
+class PDFSpec(NamedTuple):
+    """
+    A compiled ``PDF``.
+    """
+    distribution: str
+    mean: float = None
+    sigma: float = None
+    lbound: float = None
+    rbound: float = None
+
+    def get_rng(self):
+        """
+        Return a function drawing one value from the global NumPy state, as
+        ``puflib`` expects.
+        """
+        if self.distribution == 'dirac':
+            return lambda: self.mean
+        if self.distribution == 'normal':
+            return lambda: np.random.normal(self.mean, self.sigma)
+        if self.distribution == 'uniform':
+            return lambda: np.random.uniform(self.lbound, self.rbound)
+        return None
+
+    def sample(self, shape=None, rng=None):
+        """
+        Draw an array of the given shape from the distribution using the
+        ``np.random.Generator`` passed as ``rng`` (a fresh one by default).
+        """
+        if rng is None: rng = np.random.default_rng()
+        if self.distribution == 'dirac':
+            return np.full(shape or (), self.mean, dtype=float)
+        if self.distribution == 'normal':
+            return rng.normal(self.mean, self.sigma, shape)
+        if self.distribution == 'uniform':
+            return rng.uniform(self.lbound, self.rbound, shape)
+        return None
+
+
+class GeneratorSpec(NamedTuple):
+    """
+    A compiled ``PUFGenerator``.
+    """
+    architecture: str
+    stages: int
+    sensitivity: float
+    production_pdf: PDFSpec
+    sample_pdf: PDFSpec
+
+    def generate_puf(self):
+        """
+        Generate a ``puflib`` PUF based on the specifications.
+        """
+        import puflib as pl
+        p = self.production_pdf.get_rng()
+        s = self.sample_pdf.get_rng()
+        if self.architecture == 'loop':
+            return pl.Loop(self.stages, self.sensitivity, p, s)
+        if self.architecture == 'arbiter':
+            return pl.Arbiter(self.stages, self.sensitivity, p, s)
+        return None
+
+    def generate_population(self, n, rng=None):
+        """
+        Generate a population of ``n`` PUFs based on the specifications,
+        drawing the production delays of every gate at once.
+        """
+        if rng is None: rng = np.random.default_rng()
+        if self.architecture == 'arbiter':
+            gates = self.production_pdf.sample((n, self.stages, 4), rng)
+            return engine.ArbiterPopulation.from_gates(gates,
+                self.sensitivity, self.sample_pdf, rng)
+        if self.architecture == 'loop':
+            # draw the gates in the order puflib does from a legacy
+            # ``RandomState``, so they are the gates of the ``puflib`` PUFs
+            # built after seeding the global state the same way
+            legacy = np.random.RandomState(rng.integers(2**32))
+            gates = self.production_pdf.sample((n, self.stages, 4), legacy)
+            return engine.LoopPopulation(gates, self.sensitivity, self.sample_pdf, rng)
+        # puflib draws from the global state, so seed it from ``rng`` to keep
+        # the population reproducible
+        np.random.seed(rng.integers(2**32))
+        return engine.ObjectPopulation([self.generate_puf() for x in range(n)])
+
+
+class CompositeSpec(NamedTuple):
+    """
+    A compiled ``CompositePUFGenerator``.
+    """
+    architecture: str
+    child: GeneratorSpec
+    levels: int
+
+    @property
+    def stages(self):
+        return self.child.stages
+
+    def generate_puf(self):
+        """
+        Generate a ``puflib`` Composite PUF based on the specifications.
+        """
+        import puflib as pl
+        if self.architecture == 'xor':
+            return pl.Xor(pufs=[self.child.generate_puf() for x in range(self.levels)])
+        return None
+
+    def generate_population(self, n, rng=None):
+        """
+        Generate a population of ``n`` Composite PUFs based on the
+        specifications, drawing the children of every level at once.
+        """
+        if rng is None: rng = np.random.default_rng()
+        if self.architecture == 'xor' and self.child.architecture == 'arbiter':
+            child = self.child
+            gates = child.production_pdf.sample((n, self.levels, child.stages, 4), rng)
+            return engine.XorArbiterPopulation.from_gates(gates,
+                child.sensitivity, child.sample_pdf, rng)
+        if self.architecture == 'xor':
+            children = self.child.generate_population(n * self.levels, rng)
+            return engine.XorPopulation(children.split(self.levels))
+        return None
+
+
+# memory maps of the population files opened by this process, by the path
+# without the version, so there's one version per population
+POPULATION_FILES = {}
+
+
+class PopulationSpec(NamedTuple):
+    """
+    A compiled ``PUFPopulation``: the path of the built file, its version and
+    the generator whose gates it stores, ``levels`` of them per PUF.
+    """
+    path: str
+    size: int
+    child: GeneratorSpec
+    levels: int
+    version: int = None
+
+    @property
+    def stages(self):
+        return self.child.stages
+
+    def open(self):
+        """
+        Return the stored gates as a read-only memory map, which worker
+        processes share through the page cache rather than copying. Opening
+        a version drops this process's map of any other version, so the
+        file of an old version is freed once it has been removed.
+        """
+        key = self.path.rsplit('-v', 1)[0]
+        path, gates = POPULATION_FILES.get(key, (None, None))
+        if path != self.path:
+            gates = np.load(self.path, mmap_mode='r')
+            POPULATION_FILES[key] = (self.path, gates)
+        return gates
+
+    def get_population(self, start, n, rng=None):
+        """
+        Return PUFs ``start`` to ``start + n`` as an ``engine.Population``,
+        sampling from the generator's sample PDF and sensitivity.
+        """
+        if rng is None: rng = np.random.default_rng()
+        levels = self.levels
+        gates = np.asarray(self.open()[start*levels:(start+n)*levels])
+        if self.child.architecture == 'loop':
+            pop = engine.LoopPopulation(gates, self.child.sensitivity, self.child.sample_pdf, rng)
+            if levels == 1: return pop
+            return engine.XorPopulation(pop.split(levels))
+        if levels == 1:
+            return engine.ArbiterPopulation.from_gates(gates,
+                self.child.sensitivity, self.child.sample_pdf, rng)
+        gates = gates.reshape((-1, levels) + gates.shape[1:])
+        return engine.XorArbiterPopulation.from_gates(gates,
+            self.child.sensitivity, self.child.sample_pdf, rng)
@@ -1,12 +1,14 @@
 from django.urls import path, include
 from django.views.generic import RedirectView
 
+from .analysis.api import AnalyzerResultAPI
 from .custom_admin.sites import custom_admin_site
 from .views import PUFGeneratorQuicktest
 
 
 urlpatterns = [
     path('admin/pufsim/pufgenerator/<int:pk>/quicktest', PUFGeneratorQuicktest.as_view(), name='pufgenerator_quicktest'),
+    path('api/analysis/<str:model>/<int:pk>/', AnalyzerResultAPI.as_view(), name='analyzer_result_api'),
     path('admin/', custom_admin_site.urls),
     path('', RedirectView.as_view(url='/admin')),
 ]
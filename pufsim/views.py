@@ -4,19 +4,27 @@ from django.urls import reverse
 from django.views.generic import RedirectView
 
 from . import models
+from .quicktest import get_quicktest
 
 
 class PUFGeneratorQuicktest(RedirectView):
     """
-    Perform the quicktest and add the message
+    Add the message with the quicktest result, or queue the quicktest for the
+    workers if its result isn't cached yet
     """
 
     def get_redirect_url(self, *args, **kwargs):
         try:
             obj = models.PUFGenerator.objects.get(pk=kwargs['pk'])
-            res = obj.generate_puf().quicktest()
-            msg = 'PUF from PUFGenerator[{}]: Challenge <b>{}</b> returned <b>{}</b> with <b>{:.0%}</b> frequency'.format(kwargs['pk'], *res)
-            messages.add_message(self.request, messages.INFO, msg, extra_tags='safe')
+            owner = self.request.user if self.request.user.is_authenticated else None
+            res = get_quicktest(obj, owner=owner)
+            if res is None:
+                msg = 'PUFGenerator[{}]: quicktest queued, click Quicktest again in a moment'.format(kwargs['pk'])
+                messages.add_message(self.request, messages.INFO, msg)
+            else:
+                msg = 'PUFs from PUFGenerator[{}]: bias <b>{:.1f}%</b>, reliability <b>{:.2f}%</b>, <b>{:.3g} µs</b> per evaluation ({} evaluations)'.format(
+                    kwargs['pk'], res['bias'], res['reliability'], 1e6 * res['per_evaluation'], res['evaluations'])
+                messages.add_message(self.request, messages.INFO, msg, extra_tags='safe')
         except KeyError:
             messages.add_message(self.request, messages.ERROR, "quicktest failed: object not specified")
         except ObjectDoesNotExist:
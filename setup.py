@@ -23,7 +23,7 @@ setup(
     url='https://github.com/gregschmit/django-pufsim',
     author='Gregory N. Schmit',
     author_email='schmitgreg@gmail.com',
-    install_requires=['Django>=2', 'numpy', 'matplotlib', 'puflib',],
+    install_requires=['Django>=2', 'numpy>=1.17.0', 'matplotlib', 'puflib',],
     package_data={'pufsim': ['VERSION_STAMP']},
     classifiers=[
         'Environment :: Web Environment',